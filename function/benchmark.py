@@ -0,0 +1,372 @@
+"""
+Benchmark - Timings of the game's hot paths at several game lengths
+Machine-readable JSON output and comparison with a saved baseline
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from function.game_config import GameMode
+from function.game_engine import GameEngine
+from function.market_system import Market, MarketGenerator
+from function.save_system import SaveManager
+from function.terminal_ui import TerminalUI
+
+try:
+    import numpy as np
+except ImportError:  # Only reported in the environment
+    np = None
+
+SEED = 35042
+SIZES = (100, 10000, 1000000)
+FORMAT_VERSION = 1
+
+BENCHMARKS = []
+
+
+def benchmark(name, sizes=SIZES, unit="turn"):
+    """
+    Register a benchmark
+    
+    The decorated function takes a size and returns (run, ops): run() is
+    the timed callable and ops the number of operations it performs.
+    """
+    def register(setup):
+        BENCHMARKS.append({"name": name, "sizes": sizes, "unit": unit, "setup": setup})
+        return setup
+    return register
+
+
+# ----------------------------------------------------------------------
+# Fixtures (built once per size, outside the timings)
+
+_markets = {}
+_directories = []
+
+
+def market_at(size):
+    """Market played from turn 0 to `size` (shared, do not mutate)"""
+    market = _markets.get(size)
+    if market is None:
+        market = Market(SEED)
+        market.advance_turns(size)
+        _markets[size] = market
+    return market
+
+
+def copy_market(size):
+    """Private copy of market_at(size)"""
+    return Market.from_dict(market_at(size).to_dict())
+
+
+def engine_at(size):
+    """Game engine whose market is at turn `size`"""
+    engine = GameEngine.new_game("benchmark", SEED, GameMode.UNLIMITED, random_seed=SEED)
+    engine.market = copy_market(size)
+    engine.wallet.dollar = 200000
+    engine.apply({"type": "buy_card", "card_type": "RTX_3090"})
+    engine.apply({"type": "join_pool", "pool_id": "C53"})
+    return engine
+
+
+def temp_directory():
+    """Temporary directory removed after the timing"""
+    directory = tempfile.mkdtemp(prefix="benchmark_")
+    _directories.append(directory)
+    return directory
+
+
+def cleanup():
+    """Remove the temporary directories of the last run"""
+    while _directories:
+        shutil.rmtree(_directories.pop(), ignore_errors=True)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence print() of the code under test"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            yield
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+
+@benchmark("market.generate_course_chunk", unit="chunk")
+def bench_course_chunk(size):
+    generators = [MarketGenerator(SEED, legacy=True) for _ in range(5)]
+    
+    def run():
+        for generator in generators:
+            generator.generate_course_chunk(max(0, size - 100), size + 100, -50, 50)
+    return run, len(generators)
+
+
+@benchmark("market.advance_turn")
+def bench_advance_turn(size):
+    market = Market(SEED)
+    market.generator.get_cycle()  # Time the turns, not the one-off cycle build
+    
+    def run():
+        for _ in range(size):
+            market.advance_turn()
+    return run, size
+
+
+@benchmark("market.get_statistics", unit="call")
+def bench_statistics(size):
+    market = market_at(size)
+    
+    def run():
+        for _ in range(1000):
+            market.get_statistics()
+    return run, 1000
+
+
+@benchmark("market.get_trend", unit="call")
+def bench_trend(size):
+    market = market_at(size)
+    
+    def run():
+        for _ in range(1000):
+            market.get_trend()
+    return run, 1000
+
+
+@benchmark("game.process_turn")
+def bench_process_turn(size):
+    from function.main_game_loop import TraderGameLife
+    
+    game = TraderGameLife()
+    game.engine = engine_at(size)
+    
+    def run():
+        with quiet():
+            for _ in range(200):
+                game.process_turn()
+    return run, 200
+
+
+@benchmark("save.save_game", unit="save")
+def bench_save(size):
+    manager = SaveManager(temp_directory())
+    data = engine_at(size).to_dict()
+    
+    def run():
+        manager.save_game("benchmark", data)
+    return run, 1
+
+
+@benchmark("save.save_game_segments", unit="save")
+def bench_save_segments(size):
+    """Auto-save after one more turn, history in segment files"""
+    manager = SaveManager(temp_directory())
+    engine = engine_at(size)
+    manager.save_game("benchmark", engine.to_dict(history=False), history=engine.market.history)
+    engine.market.advance_turn()
+    
+    def run():
+        manager.save_game("benchmark", engine.to_dict(history=False),
+                          history=engine.market.history)
+    return run, 1
+
+
+@benchmark("save.load_game", unit="load")
+def bench_load(size):
+    manager = SaveManager(temp_directory())
+    manager.save_game("benchmark", engine_at(size).to_dict())
+    
+    def run():
+        GameEngine.from_dict(manager.load_game("benchmark"))
+    return run, 1
+
+
+@benchmark("save.save_game_binary", unit="save")
+def bench_save_binary(size):
+    manager = SaveManager(temp_directory(), save_format="binary")
+    data = engine_at(size).to_dict()
+    
+    def run():
+        manager.save_game("benchmark", data)
+    return run, 1
+
+
+@benchmark("save.load_game_binary", unit="load")
+def bench_load_binary(size):
+    manager = SaveManager(temp_directory(), save_format="binary")
+    manager.save_game("benchmark", engine_at(size).to_dict())
+    
+    def run():
+        GameEngine.from_dict(manager.load_game("benchmark"))
+    return run, 1
+
+
+@benchmark("save.list_saves", sizes=(10, 100, 300), unit="save")
+def bench_list_saves(size):
+    """Size is the number of saves (1000-turn games)"""
+    manager = SaveManager(temp_directory())
+    data = engine_at(1000).to_dict()
+    for i in range(size):
+        manager.save_game(f"game_{i}", data)
+    
+    def run():
+        manager.list_saves()
+        manager.get_most_recent_save()
+    return run, size
+
+
+@benchmark("ui.display_chart", unit="chart")
+def bench_chart(size):
+    market = market_at(size)
+    ui = TerminalUI()
+    
+    def run():
+        with quiet():
+            for _ in range(10):
+                ui.display_chart(market)
+    return run, 10
+
+
+# ----------------------------------------------------------------------
+# Runner
+
+def run_benchmarks(names=None, sizes=None, repeat=3, max_size=None, log=None):
+    """
+    Run the registered benchmarks
+    
+    Args:
+        names: Optional substrings selecting benchmarks by name
+        sizes: Optional sizes replacing every benchmark's own
+        repeat: Timed runs per benchmark (each with a fresh setup)
+        max_size: Skip sizes above this
+        log: Optional callable(result) called after each benchmark
+    
+    Returns:
+        Report dictionary
+    """
+    results = []
+    for bench in BENCHMARKS:
+        if names and not any(name in bench["name"] for name in names):
+            continue
+        
+        for size in sizes or bench["sizes"]:
+            if max_size is not None and size > max_size:
+                continue
+            
+            timings = []
+            for _ in range(repeat):
+                try:
+                    run, ops = bench["setup"](size)
+                    start = time.perf_counter()
+                    run()
+                    timings.append(time.perf_counter() - start)
+                finally:
+                    cleanup()
+            
+            best = min(timings)
+            result = {
+                "name": bench["name"],
+                "size": size,
+                "unit": bench["unit"],
+                "ops": ops,
+                "repeat": repeat,
+                "seconds": best,
+                "mean_seconds": sum(timings) / len(timings),
+                "us_per_op": best / ops * 1e6,
+            }
+            results.append(result)
+            if log:
+                log(result)
+    
+    return {
+        "format": FORMAT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "numpy": np.__version__ if np is not None else None,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=1.2):
+    """
+    Compare a report with a baseline report
+    
+    Returns:
+        List of {"name", "size", "ratio", "regression"} for the
+        benchmarks present in both (ratio > 1 means slower)
+    """
+    previous = {(result["name"], result["size"]): result for result in baseline["results"]}
+    comparison = []
+    for result in report["results"]:
+        before = previous.get((result["name"], result["size"]))
+        if before is None or before["us_per_op"] == 0:
+            continue
+        ratio = result["us_per_op"] / before["us_per_op"]
+        comparison.append({
+            "name": result["name"],
+            "size": result["size"],
+            "baseline_us_per_op": before["us_per_op"],
+            "us_per_op": result["us_per_op"],
+            "ratio": ratio,
+            "regression": ratio > threshold,
+        })
+    return comparison
+
+
+def format_result(result):
+    """One line of the human-readable table"""
+    return (f"{result['name']:<30} {result['size']:>9} "
+            f"{result['us_per_op']:>14.2f} us/{result['unit']:<6} {result['seconds']:>10.4f} s")
+
+
+def main(argv=None):
+    """Command line benchmark runner"""
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths")
+    parser.add_argument("names", nargs="*", help="Only run benchmarks whose name contains these")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None)
+    parser.add_argument("--max-size", type=int, default=None, help="Skip larger sizes (quick runs)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report instead of a table")
+    parser.add_argument("--baseline", default=None, help="JSON report to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+    
+    log = None if args.json else lambda result: print(format_result(result), flush=True)
+    report = run_benchmarks(args.names, args.sizes, args.repeat, args.max_size, log)
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report["comparison"] = compare(report, json.load(f), args.threshold)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    elif args.baseline:
+        print("\nCompared with baseline:")
+        for item in report["comparison"]:
+            flag = "  REGRESSION" if item["regression"] else ""
+            print(f"  {item['name']:<30} {item['size']:>9} x{item['ratio']:.2f}{flag}")
+    
+    regressions = [item for item in report.get("comparison", []) if item["regression"]]
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
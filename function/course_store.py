@@ -0,0 +1,229 @@
+"""
+Course Store - Precomputed course tables shared between processes
+Stores the course cycle of every seed in one memory-mapped file
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from function.market_system import MarketGenerator
+
+
+class CourseStore:
+    """Memory-mapped table of course cycles keyed by seed
+    
+    The file holds a header, one "filled" flag per seed and one fixed-size
+    record of int16 variations per seed. It is opened read-only with mmap
+    so every process playing or simulating shares the same pages.
+    """
+    
+    MAGIC = b"TGLC"
+    HEADER = struct.Struct("<4sHhHII")  # magic, version, range, period, first seed, count
+    DEFAULT_DIRECTORY = "Game_data/course_tables"
+    FIRST_SEED = 10000
+    LAST_SEED = 99999
+    
+    _default = {}
+    
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._map = None
+        self.version = None
+        self.variation_range = None
+        self.period = None
+        self.first_seed = None
+        self.seed_count = 0
+        self._open()
+    
+    @classmethod
+    def default_path(cls, directory=None, variation_range=50):
+        """Get the table path for the current generator version"""
+        directory = directory or cls.DEFAULT_DIRECTORY
+        name = f"course_table_v{MarketGenerator.VERSION}_r{variation_range}.bin"
+        return os.path.join(directory, name)
+    
+    @classmethod
+    def get_default(cls, variation_range=50):
+        """Get the shared store of the default directory (None if not built)"""
+        path = cls.default_path(variation_range=variation_range)
+        store = cls._default.get(path)
+        if store is None:
+            if not os.path.exists(path):
+                return None
+            store = cls(path)
+            cls._default[path] = store
+        return store
+    
+    def _open(self):
+        """Map the table file if it exists and is valid"""
+        if not os.path.exists(self.path):
+            return
+        
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self.close()
+            return
+        
+        if len(self._map) < self.HEADER.size:
+            self.close()
+            return
+        
+        magic, version, variation_range, period, first_seed, count = \
+            self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC or len(self._map) < self._file_size(count, period):
+            self.close()
+            return
+        
+        self.version = version
+        self.variation_range = variation_range
+        self.period = period
+        self.first_seed = first_seed
+        self.seed_count = count
+    
+    @classmethod
+    def _file_size(cls, count, period):
+        """Get the byte size of a table"""
+        return cls.HEADER.size + count + count * period * 2
+    
+    def close(self):
+        """Release the mapping"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.seed_count = 0
+    
+    def has_seed(self, seed):
+        """Check if a seed has a precomputed table"""
+        index = seed - (self.first_seed or 0)
+        if self._map is None or not 0 <= index < self.seed_count:
+            return False
+        return self._map[self.HEADER.size + index] == 1
+    
+    def load_cycle(self, seed, variation_range=50, version=None):
+        """
+        Read the course cycle of a seed
+        
+        Returns:
+            List of variations, or None if the seed, range or generator
+            version is not in the table
+        """
+        if version is None:
+            version = MarketGenerator.VERSION
+        if version != self.version or variation_range != self.variation_range:
+            return None
+        if not self.has_seed(seed):
+            return None
+        
+        record_size = self.period * 2
+        offset = self.HEADER.size + self.seed_count + (seed - self.first_seed) * record_size
+        values = array('h')
+        values.frombytes(self._map[offset:offset + record_size])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values.tolist()
+    
+    @classmethod
+    def build(cls, path=None, first_seed=FIRST_SEED, last_seed=LAST_SEED,
+              variation_range=50, workers=None, chunk_size=500):
+        """
+        Build or complete a table file, generating seeds in parallel
+        
+        Args:
+            path: Table file (default location if None)
+            first_seed, last_seed: Inclusive seed range
+            variation_range: Generator variation range
+            workers: Number of processes (all cores if None)
+            chunk_size: Seeds per worker task
+        
+        Returns:
+            Number of seeds generated
+        """
+        if first_seed < 1:
+            raise ValueError("Seeds must be positive")
+        
+        path = path or cls.default_path(variation_range=variation_range)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        
+        count = last_seed - first_seed + 1
+        period = MarketGenerator.CHUNK_AFTER + 1
+        header = cls.HEADER.pack(cls.MAGIC, MarketGenerator.VERSION, variation_range,
+                                 period, first_seed, count)
+        size = cls._file_size(count, period)
+        
+        # Keep an existing table of the same layout and only fill the gaps
+        filled = None
+        if os.path.exists(path) and os.path.getsize(path) == size:
+            with open(path, 'rb') as f:
+                if f.read(cls.HEADER.size) == header:
+                    filled = f.read(count)
+        
+        if filled is None:
+            with open(path, 'wb') as f:
+                f.write(header)
+                f.truncate(size)
+            filled = bytes(count)
+        
+        missing = [first_seed + i for i in range(count) if filled[i] != 1]
+        tasks = [(missing[i:i + chunk_size], variation_range)
+                 for i in range(0, len(missing), chunk_size)]
+        
+        record_size = period * 2
+        with open(path, 'r+b') as f, ProcessPoolExecutor(max_workers=workers) as executor:
+            for seeds, records in executor.map(_build_records, tasks):
+                for seed, record in zip(seeds, records):
+                    index = seed - first_seed
+                    f.seek(cls.HEADER.size + count + index * record_size)
+                    f.write(record)
+                    f.seek(cls.HEADER.size + index)
+                    f.write(b"\x01")
+        
+        # Drop a stale mapping of this file so later reads see the new data
+        stale = cls._default.pop(path, None)
+        if stale is not None:
+            stale.close()
+        
+        return len(missing)
+
+
+def _build_records(task):
+    """Worker: build the int16 records of a batch of seeds"""
+    seeds, variation_range = task
+    records = []
+    for seed in seeds:
+        generator = MarketGenerator(seed, variation_range, use_store=False)
+        values = array('h', generator.get_cycle())
+        if sys.byteorder != "little":
+            values.byteswap()
+        records.append(values.tobytes())
+    return seeds, records
+
+
+def main(argv=None):
+    """Command line builder"""
+    parser = argparse.ArgumentParser(description="Build the precomputed course table")
+    parser.add_argument("--path", default=None, help="Table file (default: Game_data/course_tables)")
+    parser.add_argument("--first-seed", type=int, default=CourseStore.FIRST_SEED)
+    parser.add_argument("--last-seed", type=int, default=CourseStore.LAST_SEED)
+    parser.add_argument("--variation-range", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    
+    built = CourseStore.build(args.path, args.first_seed, args.last_seed,
+                              args.variation_range, args.workers)
+    path = args.path or CourseStore.default_path(variation_range=args.variation_range)
+    print(f"Generated {built} seeds into {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -117,7 +117,6 @@ class QRCodeGenerator:
         """Generate a simple visual representation"""
         # Use hash of data to create pattern
         hash_val = hash(data)
-        random.seed(hash_val)
         
         # Create border
         result = []
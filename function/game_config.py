@@ -5,6 +5,10 @@ Manages different game modes and settings
 
 import json
 import time
+import random
+import base64
+import sys
+from array import array
 from enum import Enum
 
 class GameMode(Enum):
@@ -104,10 +108,61 @@ class GameConfig:
         return cls.from_dict(data)
 
 
+class RandomStreams:
+    """Independent random generators of a game session, one per subsystem
+    
+    Every stream is derived from a single seed, so a session can be
+    replayed, and none of them touches the global random module, so
+    sessions can run side by side in threads.
+    """
+    
+    STREAMS = ("events", "mining", "pepe")
+    
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.streams = {name: random.Random(f"{seed}:{name}") for name in self.STREAMS}
+    
+    def get(self, name):
+        """Get the generator of a subsystem"""
+        return self.streams[name]
+    
+    def to_dict(self):
+        """Convert to dictionary (states as text so save encoding keeps them exact)"""
+        states = {}
+        for name, stream in self.streams.items():
+            version, internal, gauss_next = stream.getstate()
+            values = array('I', internal)
+            if sys.byteorder != "little":
+                values.byteswap()
+            states[name] = {
+                "version": str(version),
+                "state": base64.b64encode(values.tobytes()).decode('ascii'),
+                "gauss_next": repr(gauss_next)
+            }
+        return {"seed": str(self.seed), "states": states}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create streams from dictionary"""
+        streams = cls(data["seed"])
+        for name, state in data.get("states", {}).items():
+            if name not in streams.streams:
+                continue
+            values = array('I')
+            values.frombytes(base64.b64decode(state["state"]))
+            if sys.byteorder != "little":
+                values.byteswap()
+            gauss_next = None if state["gauss_next"] == "None" else float(state["gauss_next"])
+            streams.streams[name].setstate((int(state["version"]), tuple(values), gauss_next))
+        return streams
+
+
 class GameSession:
     """Manages a game session with its configuration"""
     
-    def __init__(self, game_name, seed, config):
+    def __init__(self, game_name, seed, config, random_seed=None):
         self.game_name = game_name
         self.seed = seed
         self.sync_seed = seed  # For market synchronization
@@ -115,6 +170,7 @@ class GameSession:
         self.created_at = time.time()
         self.last_update = time.time()
         self.turn_count = 0
+        self.random = RandomStreams(random_seed)
         
     def is_time_expired(self):
         """Check if game time limit is exceeded"""
@@ -174,6 +230,7 @@ class GameSession:
             "created_at": self.created_at,
             "last_update": self.last_update,
             "turn_count": self.turn_count,
+            "random": self.random.to_dict(),
         }
     
     @classmethod
@@ -185,6 +242,8 @@ class GameSession:
         session.created_at = data["created_at"]
         session.last_update = data["last_update"]
         session.turn_count = data["turn_count"]
+        if "random" in data:
+            session.random = RandomStreams.from_dict(data["random"])
         return session
 
 
@@ -0,0 +1,756 @@
+"""
+Game Engine - Game rules without any terminal I/O
+Actions go in as dictionaries, structured results and events come out
+"""
+
+import copy
+import math
+
+from function.game_config import GameConfig, GameSession
+from function.market_system import Market
+from function.wallet_system import Wallet
+from function.mining_pools import MiningManager
+from function.random_events import EventManager, PepeEvent
+from function.exchange_qrcode import ExchangeManager
+
+
+class GameEngine:
+    """Headless game: state of one session and every player action
+    
+    Every action returns a dictionary with "success" and either "error"
+    or its results. Turn results carry an "events" list of dictionaries
+    with a "type" (alert, sale, mining, random_event, pepe).
+    """
+    
+    # Action type -> method
+    ACTIONS = {
+        "buy": "buy_arobase",
+        "sell": "sell_arobase",
+        "cancel": "cancel_sale",
+        "mine": "mine",
+        "fast_forward": "fast_forward",
+        "buy_card": "buy_card",
+        "sell_card": "sell_card",
+        "buy_collectible": "buy_collectible",
+        "buy_victory": "buy_victory",
+        "join_pool": "join_pool",
+        "leave_pool": "leave_pool",
+        "send": "send_exchange",
+        "receive": "receive_exchange",
+        "pepe_start": "pepe_start",
+        "pepe_answer": "pepe_answer",
+    }
+    
+    # Action type -> {parameter: (kind, required)}, checked by apply
+    PARAMS = {
+        "buy": {"amount": ("number", True)},
+        "sell": {"amount": ("number", True)},
+        "cancel": {},
+        "mine": {"turns": ("integer", False)},
+        "fast_forward": {"turns": ("integer", True)},
+        "buy_card": {"card_type": ("text", True)},
+        "sell_card": {"card_type": ("text", True)},
+        "buy_collectible": {"item_type": ("text", True)},
+        "buy_victory": {},
+        "join_pool": {"pool_id": ("text", True), "secret_code": ("text_or_none", False)},
+        "leave_pool": {},
+        "send": {"currency_type": ("text", True), "amount": ("number", True)},
+        "receive": {"code": ("text", True)},
+        "pepe_start": {},
+        "pepe_answer": {"answer": ("text_or_none", False)},
+    }
+    
+    # Parameter kind -> description ("number" is a finite int or float)
+    PARAM_KINDS = {
+        "number": "a number",
+        "integer": "an integer",
+        "text": "text",
+        "text_or_none": "text or None",
+    }
+    
+    # Turns between two time limit checks of fast_forward
+    FAST_FORWARD_CHUNK = 10000
+    
+    # Parts of the saved state (see save_state)
+    PARTS = ("session", "market", "wallet", "mining", "pepe")
+    
+    # Action type -> parts it can change (turns mark everything themselves)
+    DIRTY_PARTS = {
+        "buy": ("wallet",),
+        "sell": ("wallet",),
+        "cancel": ("wallet",),
+        "mine": (),
+        "fast_forward": (),
+        "buy_card": ("wallet",),
+        "sell_card": ("wallet",),
+        "buy_collectible": ("wallet",),
+        "buy_victory": ("wallet",),
+        "join_pool": ("mining", "wallet"),
+        "leave_pool": ("mining",),
+        "send": ("wallet",),
+        "receive": ("wallet",),
+        "pepe_start": ("pepe", "session"),  # Draws from the session's pepe stream
+        "pepe_answer": ("pepe", "wallet"),
+    }
+    
+    def __init__(self, session, market, wallet, mining_manager,
+                 event_manager=None, exchange_manager=None):
+        self.session = session
+        self.market = market
+        self.wallet = wallet
+        self.mining_manager = mining_manager
+        self.event_manager = event_manager or EventManager()
+        self.exchange_manager = exchange_manager or ExchangeManager()
+        self.pepe_available = False
+        self.pepe_question = None
+        self.profiler = None  # Optional StageProfiler timing process_turn
+        self.journal = None   # Optional save_system.ActionJournal recording actions
+        
+        # Dirty tracking: generation of the last change of the game and of each part
+        self.generation = 0
+        self._part_generations = dict.fromkeys(self.PARTS, 0)
+        self._saved_parts = {}  # part -> (generation, frozen dictionary)
+        self._context = None    # Cached _turn_context, cleared by mark_dirty
+        self._replaying = False
+        
+        # Every random draw of the game comes from the session streams
+        self.mining_manager.use_random(session.random.get("mining"))
+        self.event_manager.rng = session.random.get("events")
+        self.pepe_random = session.random.get("pepe")
+    
+    @classmethod
+    def new_game(cls, game_name, seed, game_mode, random_seed=None):
+        """Create the engine of a new game (random_seed makes it replayable)"""
+        config = GameConfig(game_mode)
+        session = GameSession(game_name, seed, config, random_seed)
+        market = Market(seed, config.settings["starting_course"])
+        wallet = Wallet(
+            config.settings["starting_dollar"],
+            config.settings["starting_arobase"]
+        )
+        return cls(session, market, wallet, MiningManager())
+    
+    def to_dict(self, history=True):
+        """Convert game state to dictionary for saving (see Market.to_dict)"""
+        return {part: self._part_dict(part, history) for part in self.PARTS}
+    
+    def _part_dict(self, part, history=True):
+        if part == "session":
+            return self.session.to_dict()
+        if part == "market":
+            return self.market.to_dict(history)
+        if part == "wallet":
+            return self.wallet.to_dict()
+        if part == "mining":
+            return self.mining_manager.to_dict()
+        return {
+            "available": "1" if self.pepe_available else "0",
+            "question": self.pepe_question
+        }
+    
+    def mark_dirty(self, *parts):
+        """
+        Record a change of the game state (all parts if none given)
+        
+        Actions call it; code changing the state directly must call it
+        too, or save_state and the next turns keep the old values.
+        """
+        self._context = None
+        self._mark_turn(parts)
+    
+    def _mark_turn(self, parts=()):
+        """mark_dirty without clearing the turn context (turns keep it)"""
+        self.generation += 1
+        for part in parts or self.PARTS:
+            self._part_generations[part] = self.generation
+    
+    def save_state(self):
+        """
+        State to save, market history left out (like to_dict(history=False))
+        
+        Only the parts changed since the previous call are rebuilt; the
+        others are the same frozen dictionaries, which must not be modified.
+        """
+        state = {}
+        for part in self.PARTS:
+            generation = self._part_generations[part]
+            saved = self._saved_parts.get(part)
+            if saved is None or saved[0] != generation:
+                saved = (generation, copy.deepcopy(self._part_dict(part, history=False)))
+                self._saved_parts[part] = saved
+            state[part] = saved[1]
+        return state
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create engine from saved game state"""
+        engine = cls(
+            GameSession.from_dict(data["session"]),
+            Market.from_dict(data["market"]),
+            Wallet.from_dict(data["wallet"]),
+            MiningManager.from_dict(data["mining"])
+        )
+        
+        pepe = data.get("pepe", {})
+        engine.pepe_available = pepe.get("available") == "1"
+        engine.pepe_question = pepe.get("question")
+        return engine
+    
+    # ------------------------------------------------------------------
+    # Dispatch
+    
+    def apply(self, action):
+        """
+        Apply a player action
+        
+        Args:
+            action: Dictionary with a "type" (see ACTIONS) and the
+                    parameters of the matching method
+        
+        Returns:
+            Result dictionary of the action
+        """
+        if not isinstance(action, dict):
+            return {"success": False, "error": "Invalid action: not a dictionary"}
+        
+        params = dict(action)
+        action_type = params.pop("type", None)
+        name = self.ACTIONS.get(action_type)
+        if name is None:
+            return {"success": False, "error": f"Unknown action: {action_type}"}
+        
+        error = self._check_params(self.PARAMS[action_type], params)
+        if error is not None:
+            return {"success": False, "error": f"Invalid action: {error}"}
+        
+        result = getattr(self, name)(**params)
+        if result.get("success"):
+            parts = self.DIRTY_PARTS.get(action_type, self.PARTS)
+            if parts:
+                self.mark_dirty(*parts)
+            if self.journal is not None:
+                if result.get("turns", params.get("turns")) != params.get("turns"):
+                    action = dict(action, turns=result["turns"])  # Stopped at a limit
+                self.journal.record(action, self.market.current_turn)
+        return result
+    
+    @staticmethod
+    def _check_params(schema, params):
+        """Error message for params not matching schema, or None"""
+        for param in params:
+            if param not in schema:
+                return f"unexpected parameter '{param}'"
+        
+        for param, (kind, required) in schema.items():
+            if param not in params:
+                if required:
+                    return f"missing parameter '{param}'"
+                continue
+            
+            value = params[param]
+            if kind == "number":
+                valid = isinstance(value, (int, float)) and not isinstance(value, bool) \
+                    and math.isfinite(value)
+            elif kind == "integer":
+                valid = isinstance(value, int) and not isinstance(value, bool)
+            elif kind == "text_or_none":
+                valid = value is None or isinstance(value, str)
+            else:
+                valid = isinstance(value, str)
+            if not valid:
+                return f"'{param}' must be {GameEngine.PARAM_KINDS[kind]}"
+        return None
+    
+    def replay(self, entries):
+        """
+        Re-apply journaled actions (see save_system.ActionJournal)
+        
+        Replay stops at the first entry that fails or does not end on
+        its recorded turn, which means the journal does not match.
+        
+        Returns:
+            Number of entries replayed
+        """
+        journal, self.journal = self.journal, None
+        self._replaying = True  # The time limit was checked when recorded
+        replayed = 0
+        try:
+            for entry in entries:
+                if not isinstance(entry, dict) or "action" not in entry:
+                    break
+                result = self.apply(entry["action"])
+                if not result.get("success") or self.market.current_turn != entry.get("turn"):
+                    break
+                replayed += 1
+        finally:
+            self.journal = journal
+            self._replaying = False
+        return replayed
+    
+    # ------------------------------------------------------------------
+    # Rules
+    
+    def calculate_malus_level(self):
+        """Calculate malus level from seed"""
+        return int(self.session.seed / 10000)
+    
+    def calculate_tax(self):
+        """Calculate transaction tax"""
+        tax = int(self.wallet.max_dollar / 1000)
+        return tax
+    
+    def get_score(self):
+        """Current score"""
+        return self.wallet.calculate_score(self.market.current_course)
+    
+    def catalog_info(self):
+        """Mode, turn and score listed in the save catalog"""
+        return {
+            "mode": self.session.config.mode.value,
+            "turn": self.market.current_turn,
+            "score": self.get_score()
+        }
+    
+    @staticmethod
+    def catalog_info_from_dict(data):
+        """catalog_info() of saved game data, without building the game"""
+        market = data["market"]
+        wallet = Wallet.from_dict(data["wallet"])
+        return {
+            "mode": data["session"]["config"]["mode"],
+            "turn": int(round(market["current_turn"])),  # Encoded saves load floats
+            "score": wallet.calculate_score(market["current_course"])
+        }
+    
+    def check_game_over(self):
+        """
+        Check if game should end
+        
+        Returns:
+            None, or dictionary with reason and victory
+        """
+        # Bankruptcy
+        if self.wallet.dollar < 0:
+            return {"reason": "Bankruptcy - Negative balance", "victory": False}
+        
+        # Time/turn limit
+        if self.session.is_game_over():
+            reason = "Time limit reached" if self.session.is_time_expired() else "Turn limit reached"
+            return {"reason": reason, "victory": False}
+        
+        # Victory condition
+        if self.wallet.victory_purchased:
+            return {"reason": "Game ended", "victory": True}
+        
+        return None
+    
+    # ------------------------------------------------------------------
+    # Trading
+    
+    def sell_arobase(self, amount):
+        """Put arobase up for sale (pays the tax)"""
+        tax = self.calculate_tax()
+        
+        if amount <= 0:
+            return {"success": False, "error": "Amount must be positive"}
+        
+        if amount > self.wallet.arobase:
+            return {"success": False, "error": "Insufficient arobase"}
+        
+        if not self.wallet.can_afford(tax):
+            return {"success": False, "error": "Cannot afford tax"}
+        
+        self.wallet.put_arobase_for_sale(amount)
+        self.wallet.remove_dollar(tax)
+        return {"success": True, "amount": amount, "tax": tax}
+    
+    def buy_arobase(self, amount):
+        """Spend `amount` dollars on arobase (plus the tax)"""
+        tax = self.calculate_tax()
+        max_spend = self.wallet.dollar - tax
+        
+        if max_spend <= 0:
+            return {"success": False, "error": "Cannot afford tax"}
+        
+        if amount <= 0:
+            return {"success": False, "error": "Amount must be positive"}
+        
+        if amount > max_spend:
+            return {"success": False, "error": "Insufficient funds"}
+        
+        arobase_amount = self.market.calculate_buy_amount(amount, 0)
+        self.wallet.remove_dollar(amount + tax)
+        self.wallet.add_arobase(arobase_amount)
+        return {"success": True, "arobase": arobase_amount, "dollar": amount, "tax": tax}
+    
+    def cancel_sale(self):
+        """Cancel arobase sale"""
+        amount = self.wallet.arobase_for_sale
+        self.wallet.cancel_sale()
+        return {"success": True, "amount": amount}
+    
+    # ------------------------------------------------------------------
+    # Turns
+    
+    def mine(self, turns=1):
+        """
+        Play turns (market, sales, mining, events, Pepe)
+        
+        One turn returns its events; several turns are played with
+        fast_forward and return its summary.
+        """
+        if turns < 1:
+            return {"success": False, "error": "Turns must be positive"}
+        if turns > 1:
+            return self.fast_forward(turns)
+        
+        events = self.process_turn()
+        return {
+            "success": True,
+            "turn": self.market.current_turn,
+            "course": self.market.current_course,
+            "events": events
+        }
+    
+    def process_turn(self):
+        """
+        Process game turn (mining, sales, events)
+        
+        Returns:
+            List of event dictionaries
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start("turn", turn=self.market.current_turn + 1)
+        
+        self._mark_turn()
+        self.session.turn_count += 1
+        
+        # Advance market
+        self.market.advance_turn()
+        if profiler is not None:
+            profiler.mark("market")
+        
+        events = []
+        self._play_turn(self.market.current_course, self._turn_context(), events=events,
+                        profiler=profiler)
+        if profiler is not None:
+            profiler.end()
+        return events
+    
+    def _turn_context(self):
+        """Values a turn reads that only player actions can change (cached)"""
+        if self._context is not None:
+            return self._context
+        settings = self.session.config.settings
+        self._context = {
+            "power": self.wallet.get_total_power(),
+            "base_gain": settings.get("base_gain", 1.0),
+            "random_events": settings.get("random_events", True),
+            "malus_level": self.calculate_malus_level(),
+            "reduces_malus": self.mining_manager.reduces_malus(),
+        }
+        return self._context
+    
+    def _play_turn(self, course, context, summary=None, events=None, profiler=None):
+        """
+        Play a turn once the market has moved (sales, mining, events, Pepe)
+        
+        Args:
+            course: Course of the turn
+            context: Values from _turn_context
+            summary: Totals to update (fast_forward), or None
+            events: List receiving the turn events, None to skip them
+            profiler: StageProfiler timing each stage, or None
+        """
+        # Check for market alerts (HELLO pool)
+        if events is not None:
+            alerts = self.mining_manager.get_market_alerts(
+                course,
+                self.market.course_max,
+                self.market.course_min
+            )
+            for alert in alerts:
+                events.append({"type": "alert", "message": alert})
+        
+        if profiler is not None:
+            profiler.mark("alerts")
+        
+        # Process arobase sales
+        if self.wallet.arobase_for_sale > 0:
+            sold_amount = self.mining_manager.process_sale(
+                self.wallet.arobase_for_sale,
+                course
+            )
+            
+            if sold_amount > 0:
+                dollar_received = sold_amount * course
+                actual_sold = self.wallet.process_sale(sold_amount, dollar_received)
+                if summary is not None:
+                    summary["sold"] += actual_sold
+                    summary["sales_income"] += dollar_received
+                if events is not None:
+                    events.append({"type": "sale", "arobase": actual_sold,
+                                   "dollar": dollar_received})
+        
+        if profiler is not None:
+            profiler.mark("sales")
+        
+        # Mining rewards
+        if self.mining_manager.current_pool:
+            mining_result = self.mining_manager.mine(
+                context["power"],
+                context["base_gain"]
+            )
+            
+            if mining_result["arobase"] > 0:
+                self.wallet.add_arobase(mining_result["arobase"])
+                if summary is not None:
+                    summary["mined"] += mining_result["arobase"]
+            
+            if mining_result["dollar"] != 0:
+                if mining_result["dollar"] > 0:
+                    self.wallet.add_dollar(mining_result["dollar"])
+                    applied = True
+                else:
+                    applied = self.wallet.remove_dollar(abs(mining_result["dollar"]))
+                if applied and summary is not None:
+                    summary["pool_dollar"] += mining_result["dollar"]
+            
+            if events is not None:
+                events.append({"type": "mining", "arobase": mining_result["arobase"],
+                               "dollar": mining_result["dollar"],
+                               "messages": mining_result["messages"]})
+        
+        if profiler is not None:
+            profiler.mark("mining")
+        
+        # Random events (malus)
+        if context["random_events"]:
+            has_threshold = self.wallet.dollar > 1000
+            
+            if self.event_manager.should_trigger_event(context["malus_level"], has_threshold,
+                                                       context["reduces_malus"]):
+                event = self.event_manager.trigger_random_event(self.wallet.dollar)
+                if event:
+                    self.wallet.remove_dollar(event["cost"])
+                    if summary is not None:
+                        summary["events"] += 1
+                        summary["event_cost"] += event["cost"]
+                    if events is not None:
+                        events.append(dict(event, type="random_event"))
+        
+        if profiler is not None:
+            profiler.mark("events")
+        
+        # Check Pepe appearance
+        if self.pepe_random.randint(1, 20) == 1:
+            if events is not None and not self.pepe_available:
+                events.append({"type": "pepe"})
+            self.pepe_available = True
+        
+        if profiler is not None:
+            profiler.mark("pepe")
+        
+        # Round values
+        self.wallet.round_values()
+        if profiler is not None:
+            profiler.mark("round")
+    
+    def fast_forward(self, turns):
+        """
+        Play several turns in one call without building events
+        
+        Gives the same results as calling process_turn `turns` times from
+        the same random state. Stops at the turn limit, and at the time
+        limit (checked every FAST_FORWARD_CHUNK turns, not on replay).
+        
+        Returns:
+            Summary dictionary of the turns played
+        """
+        if turns < 1:
+            return {"success": False, "error": "Turns must be positive"}
+        
+        turns_remaining = self.session.get_turns_remaining()
+        if turns_remaining is not None:
+            turns = min(turns, turns_remaining)
+        timed = not self._replaying and self.session.config.settings.get("time_limit") is not None
+        if turns < 1 or (timed and self.session.is_time_expired()):
+            return {"success": False, "error": "No turns left"}
+        
+        summary = {
+            "success": True,
+            "turns": 0,
+            "start_turn": self.market.current_turn,
+            "start_dollar": self.wallet.dollar,
+            "start_arobase": self.wallet.arobase,
+            "sold": 0,
+            "sales_income": 0,
+            "mined": 0,
+            "pool_dollar": 0,
+            "events": 0,
+            "event_cost": 0,
+        }
+        
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start("fast_forward", turn=self.market.current_turn + 1, turns=turns)
+        
+        self._mark_turn()
+        context = self._turn_context()
+        chunk = self.FAST_FORWARD_CHUNK if timed else turns
+        while summary["turns"] < turns:
+            count = min(chunk, turns - summary["turns"])
+            
+            # The market does not depend on the wallet: move it in one go
+            courses = self.market.advance_turns(count)
+            self.session.turn_count += count
+            self._play_turns(courses.tolist(), context, summary)
+            summary["turns"] += count
+            
+            if timed and self.session.is_time_expired():
+                break
+        if profiler is not None:
+            profiler.mark("fast_forward")
+            profiler.end()
+        
+        summary["end_turn"] = self.market.current_turn
+        summary["course"] = self.market.current_course
+        summary["dollar"] = self.wallet.dollar
+        summary["arobase"] = self.wallet.arobase
+        summary["score"] = self.get_score()
+        return summary
+    
+    def _play_turns(self, courses, context, summary):
+        """
+        _play_turn for each course, without events
+        
+        Once nothing but Pepe can happen (no pool, nothing for sale, no
+        event possible, values already rounded), the remaining turns only
+        draw the Pepe stream, as _play_turn would.
+        """
+        wallet = self.wallet
+        played = 0
+        for course in courses:
+            self._play_turn(course, context, summary)
+            played += 1
+            if (not self.mining_manager.current_pool and wallet.arobase_for_sale <= 0
+                    and not (context["random_events"] and wallet.dollar > 1000)):
+                break
+        
+        # Idle turns left: the rounded wallet stays the same
+        for _ in range(len(courses) - played):
+            if self.pepe_random.randint(1, 20) == 1:
+                self.pepe_available = True
+    
+    # ------------------------------------------------------------------
+    # Shop
+    
+    def buy_card(self, card_type):
+        """Buy a graphics card"""
+        return self.wallet.buy_card(card_type)
+    
+    def sell_card(self, card_type):
+        """Sell a graphics card"""
+        return self.wallet.sell_card(card_type)
+    
+    def buy_collectible(self, item_type):
+        """Buy a collectible item"""
+        return self.wallet.buy_collectible(item_type)
+    
+    def buy_victory(self):
+        """Purchase victory condition"""
+        return self.wallet.buy_victory()
+    
+    # ------------------------------------------------------------------
+    # Mining pools
+    
+    def join_pool(self, pool_id, secret_code=None):
+        """Join a mining pool (pays the ITS+ welcome bonus)"""
+        result = self.mining_manager.join_pool(pool_id, secret_code)
+        if result["success"] and "welcome_bonus" in result:
+            self.wallet.add_dollar(result["welcome_bonus"])
+        return result
+    
+    def leave_pool(self):
+        """Leave current pool"""
+        self.mining_manager.leave_pool()
+        return {"success": True}
+    
+    # ------------------------------------------------------------------
+    # Exchange
+    
+    def send_exchange(self, currency_type, amount):
+        """Take currency from the wallet and create an exchange code"""
+        if currency_type == "dollar":
+            available = self.wallet.dollar
+        elif currency_type == "arobase":
+            available = self.wallet.arobase
+        else:
+            return {"success": False, "error": "Invalid currency"}
+        
+        if amount <= 0:
+            return {"success": False, "error": "Amount must be positive"}
+        
+        if amount > available:
+            return {"success": False, "error": "Insufficient funds"}
+        
+        if self.exchange_manager.get_active_code():
+            return {"success": False, "error": "An exchange code is already active"}
+        
+        # Deduct from wallet
+        if currency_type == "dollar":
+            self.wallet.remove_dollar(amount)
+        else:
+            self.wallet.remove_arobase(amount)
+        
+        code = self.exchange_manager.create_exchange_code(
+            int(amount),
+            currency_type,
+            self.session.game_name
+        )
+        return {"success": True, "code": code}
+    
+    def receive_exchange(self, code):
+        """Receive currency using a code"""
+        result = self.exchange_manager.receive_exchange(code)
+        
+        if result["success"]:
+            if result["currency_type"] == "dollar":
+                self.wallet.add_dollar(result["amount"])
+            else:
+                self.wallet.add_arobase(result["amount"])
+        
+        return result
+    
+    # ------------------------------------------------------------------
+    # Pepe
+    
+    def pepe_start(self):
+        """Start the Pepe quiz if Pepe appeared"""
+        if not self.pepe_available:
+            return {"success": False, "error": "Pepe is not here"}
+        
+        self.pepe_question = PepeEvent.pick_question(self.market.current_course, self.pepe_random)
+        return {"success": True, "question": self.pepe_question["question"]}
+    
+    def pepe_answer(self, answer=None):
+        """
+        Answer the Pepe quiz (None declines)
+        
+        A right answer multiplies dollars by 1.5, a wrong one halves them.
+        """
+        if not self.pepe_available:
+            return {"success": False, "error": "Pepe is not here"}
+        
+        if answer is None or self.pepe_question is None:
+            result = {"success": False, "multiplier": 1.0, "valid": True}
+        else:
+            result = PepeEvent.check_answer(self.pepe_question, answer)
+        
+        self.wallet.dollar *= result["multiplier"]
+        self.pepe_available = False
+        self.pepe_question = None
+        
+        return {"success": True, "correct": result["success"],
+                "multiplier": result["multiplier"], "valid": result["valid"]}
@@ -1,6 +1,6 @@
 """
-Main Game Loop - Complete game engine
-Integrates all systems and manages game flow
+Main Game Loop - Terminal client of the game engine
+Reads player input, applies it to the GameEngine and shows the results
 """
 
 import time
@@ -10,13 +10,11 @@ import os
 
 # Import all game systems
 try:
-    from function.game_config import GameConfig, GameSession, GameMode, create_game_mode_selector
-    from function.market_system import Market
-    from function.wallet_system import Wallet, GraphicsCard
-    from function.mining_pools import MiningManager
-    from function.random_events import EventManager, PepeEvent, AchievementChecker
+    from function.game_config import GameMode, create_game_mode_selector
+    from function.game_engine import GameEngine
+    from function.profiler import from_environment as profiler_from_environment
+    from function.random_events import PepeEvent, AchievementChecker
     from function.save_system import SaveManager, AutoSaveManager
-    from function.exchange_qrcode import ExchangeManager
     from function.terminal_ui import TerminalUI, ColorText
 except ImportError:
     print("Error: Missing required modules")
@@ -25,75 +23,64 @@ except ImportError:
 
 
 class TraderGameLife:
-    """Main game class orchestrating all systems"""
-    
-    def __init__(self):
-        self.session = None
-        self.market = None
-        self.wallet = None
-        self.mining_manager = None
-        self.event_manager = None
-        self.exchange_manager = None
-        self.save_manager = SaveManager()
+    """Terminal client: reads player input and shows the GameEngine results"""
+    
+    def __init__(self, profiler=None):
+        self.engine = None
+        self.save_manager = SaveManager(catalog_info=GameEngine.catalog_info_from_dict)
         self.auto_save = None
         
+        # Opt-in stage timings (TRADER_PROFILE=1 or TRADER_PROFILE=file.jsonl)
+        self.profiler = profiler or profiler_from_environment()
+        
         self.ui = TerminalUI()
         self.running = False
-        self.pepe_available = False
+    
+    # Game state lives in the engine
+    session = property(lambda self: self.engine.session if self.engine else None)
+    market = property(lambda self: self.engine.market if self.engine else None)
+    wallet = property(lambda self: self.engine.wallet if self.engine else None)
+    mining_manager = property(lambda self: self.engine.mining_manager if self.engine else None)
+    event_manager = property(lambda self: self.engine.event_manager if self.engine else None)
+    exchange_manager = property(lambda self: self.engine.exchange_manager if self.engine else None)
+    pepe_available = property(lambda self: self.engine.pepe_available if self.engine else False)
     
     def initialize_new_game(self, game_name, seed, game_mode):
         """Initialize a new game"""
-        # Create game configuration
-        config = GameConfig(game_mode)
-        self.session = GameSession(game_name, seed, config)
-        
-        # Initialize market
-        self.market = Market(seed, config.settings["starting_course"])
+        self.engine = GameEngine.new_game(game_name, seed, game_mode)
+        self.engine.profiler = self.profiler
+        self.open_journal()
         
-        # Initialize wallet
-        self.wallet = Wallet(
-            config.settings["starting_dollar"],
-            config.settings["starting_arobase"]
-        )
-        
-        # Initialize managers
-        self.mining_manager = MiningManager()
-        self.event_manager = EventManager()
-        self.exchange_manager = ExchangeManager()
-        
-        # Auto-save manager
-        self.auto_save = AutoSaveManager(self.save_manager)
+        # Auto-save manager (writes on a worker thread)
+        self.auto_save = AutoSaveManager(self.save_manager, background=True)
         
         print(ColorText.success("Game initialized!"))
         self.ui.pause()
     
     def load_game(self, game_name):
         """Load an existing game"""
-        data = self.save_manager.load_game(game_name)
+        data, entries, journal_seq = self.save_manager.load_game_journal(game_name)
         
         if data is None:
             print(ColorText.error(f"Could not load game: {game_name}"))
             return False
         
         try:
-            # Restore session
-            self.session = GameSession.from_dict(data["session"])
-            
-            # Restore market
-            self.market = Market.from_dict(data["market"])
-            
-            # Restore wallet
-            self.wallet = Wallet.from_dict(data["wallet"])
-            
-            # Restore mining manager
-            self.mining_manager = MiningManager.from_dict(data["mining"])
-            
-            # Initialize managers that don't save state
-            self.event_manager = EventManager()
-            self.exchange_manager = ExchangeManager()
-            
-            # Auto-save manager
-            self.auto_save = AutoSaveManager(self.save_manager)
+            self.engine = GameEngine.from_dict(data)
+            self.engine.profiler = self.profiler
+            
+            # Actions saved after the snapshot
+            replayed = self.engine.replay(entries)
+            if replayed < len(entries):
+                print(ColorText.warning(
+                    f"Journal does not match the save: {len(entries) - replayed} actions dropped"
+                ))
+            self.open_journal(journal_seq)
+            
+            # Auto-save manager (writes on a worker thread)
+            self.auto_save = AutoSaveManager(self.save_manager, background=True)
+            if not entries:
+                self.auto_save.saved_generation = self.engine.generation  # Same as the file
             
             print(ColorText.success(f"Game loaded: {game_name}"))
             self.display_game_status()
@@ -104,6 +91,18 @@ class TraderGameLife:
             print(ColorText.error(f"Corrupted save file: {e}"))
             return False
     
+    def open_journal(self, seq=0):
+        """Journal mode: snapshot the game and record its next actions"""
+        if self.save_manager.save_mode != "journal":
+            return
+        self.engine.journal = self.save_manager.start_journal(
+            self.session.game_name, self.save_data(), seq, history=self.market.history
+        )
+    
+    def save_data(self):
+        """Game state to save (the market history goes to segment files)"""
+        return self.engine.save_state()
+    
     def save_game(self):
         """Save current game state"""
         if self.session is None:
@@ -112,20 +111,22 @@ class TraderGameLife:
         
         # Update last update time
         self.session.last_update = time.time()
+        self.engine.mark_dirty("session")
         
-        # Prepare save data
-        save_data = {
-            "session": self.session.to_dict(),
-            "market": self.market.to_dict(),
-            "wallet": self.wallet.to_dict(),
-            "mining": self.mining_manager.to_dict()
-        }
+        if self.auto_save is None:
+            self.auto_save = AutoSaveManager(self.save_manager, background=True)
         
-        success = self.save_manager.save_game(
+        # Same path as auto-saves (no write races), then wait for the disk
+        self.auto_save.save(
             self.session.game_name,
-            save_data,
-            encode=True
+            self.save_data,
+            self.engine.journal,
+            self.market.history,
+            snapshot=True,
+            info=self.engine.catalog_info,
+            frozen=True
         )
+        success = self.auto_save.flush()
         
         if success:
             print(ColorText.success("Game saved!"))
@@ -153,88 +154,55 @@ class TraderGameLife:
         print(f"Power: {self.wallet.get_total_power()}")
         print(f"Pool: {self.mining_manager.get_current_pool_name()}")
         
-        score = self.wallet.calculate_score(self.market.current_course)
+        score = self.engine.get_score()
         print(f"Score: {score}")
         print("="*60 + "\n")
     
     def process_turn(self):
-        """Process game turn (mining, sales, events)"""
-        self.session.turn_count += 1
-        
-        # Advance market
-        self.market.advance_turn()
-        
-        # Check for market alerts (HELLO pool)
-        alerts = self.mining_manager.get_market_alerts(
-            self.market.current_course,
-            self.market.course_max,
-            self.market.course_min
-        )
-        for alert in alerts:
-            print(ColorText.warning(alert))
-        
-        # Process arobase sales
-        if self.wallet.arobase_for_sale > 0:
-            sold_amount = self.mining_manager.process_sale(
-                self.wallet.arobase_for_sale,
-                self.market.current_course
-            )
-            
-            if sold_amount > 0:
-                dollar_received = sold_amount * self.market.current_course
-                actual_sold = self.wallet.process_sale(sold_amount, dollar_received)
-                print(ColorText.success(f"Sold {actual_sold:.5f}@ for ${dollar_received:.2f}"))
-        
-        # Mining rewards
-        if self.mining_manager.current_pool:
-            mining_result = self.mining_manager.mine(
-                self.wallet.get_total_power(),
-                self.session.config.settings.get("base_gain", 1.0)
-            )
-            
-            if mining_result["arobase"] > 0:
-                self.wallet.add_arobase(mining_result["arobase"])
-            
-            if mining_result["dollar"] != 0:
-                if mining_result["dollar"] > 0:
-                    self.wallet.add_dollar(mining_result["dollar"])
-                else:
-                    self.wallet.remove_dollar(abs(mining_result["dollar"]))
-            
-            for msg in mining_result["messages"]:
-                print(msg)
-        
-        # Random events (malus)
-        if self.session.config.settings.get("random_events", True):
-            malus_level = self.calculate_malus_level()
-            has_threshold = self.wallet.dollar > 1000
-            reduces_malus = self.mining_manager.reduces_malus()
-            
-            if self.event_manager.should_trigger_event(malus_level, has_threshold, reduces_malus):
-                event = self.event_manager.trigger_random_event(self.wallet.dollar)
-                if event:
-                    self.event_manager.display_event(event)
-                    self.wallet.remove_dollar(event["cost"])
-        
-        # Check Pepe appearance
-        if random.randint(1, 20) == 1:
-            self.pepe_available = True
-        
-        # Round values
-        self.wallet.round_values()
-    
-    def calculate_malus_level(self):
-        """Calculate malus level from seed"""
-        return int(self.session.seed / 10000)
-    
-    def calculate_tax(self):
-        """Calculate transaction tax"""
-        tax = int(self.wallet.max_dollar / 1000)
-        return tax
+        """Play one turn and show what happened"""
+        result = self.engine.apply({"type": "mine"})
+        self.display_turn_events(result["events"])
+    
+    def display_turn_events(self, events):
+        """Display the events of a turn"""
+        random_event = None
+        for event in events:
+            if event["type"] == "alert":
+                print(ColorText.warning(event["message"]))
+            elif event["type"] == "sale":
+                print(ColorText.success(f"Sold {event['arobase']:.5f}@ for ${event['dollar']:.2f}"))
+            elif event["type"] == "mining":
+                for message in event["messages"]:
+                    print(message)
+            elif event["type"] == "random_event":
+                random_event = event
+        
+        if random_event:
+            self.event_manager.display_event(random_event)
+    
+    def fast_forward(self, turns):
+        """Play several turns without printing (see GameEngine.fast_forward)"""
+        return self.engine.apply({"type": "fast_forward", "turns": turns})
+    
+    def display_fast_forward(self, summary):
+        """Display the summary of a fast-forward"""
+        print(ColorText.success(
+            f"Played {summary['turns']} turns (turn {summary['start_turn']} -> {summary['end_turn']})"
+        ))
+        print(f"  Course: ${summary['course']:.2f}")
+        if summary["sold"]:
+            print(f"  Sold: {summary['sold']:.5f}@ for ${summary['sales_income']:.2f}")
+        if summary["mined"]:
+            print(f"  Mined: {summary['mined']:.5f}@")
+        if summary["pool_dollar"]:
+            print(f"  Pool: ${summary['pool_dollar']:+.2f}")
+        if summary["events"]:
+            print(ColorText.warning(f"{summary['events']} random events cost ${summary['event_cost']}"))
+        print(f"  Balance: ${summary['dollar']:.2f} | {summary['arobase']:.5f}@")
     
     def handle_sell_arobase(self):
         """Handle selling arobase"""
-        tax = self.calculate_tax()
+        tax = self.engine.calculate_tax()
         
         print(f"\nTax: ${tax}")
         print(f"Available: {self.wallet.arobase:.5f}@")
@@ -257,13 +225,15 @@ class TraderGameLife:
         print(f"\nSelling {amount:.5f}@ ≈ ${dollar_value:.2f}")
         
         if self.ui.confirm("Confirm"):
-            self.wallet.put_arobase_for_sale(amount)
-            self.wallet.remove_dollar(tax)
-            print(ColorText.success("Put up for sale!"))
+            result = self.engine.apply({"type": "sell", "amount": amount})
+            if result["success"]:
+                print(ColorText.success("Put up for sale!"))
+            else:
+                print(ColorText.error(result["error"]))
     
     def handle_buy_arobase(self):
         """Handle buying arobase"""
-        tax = self.calculate_tax()
+        tax = self.engine.calculate_tax()
         max_spend = self.wallet.dollar - tax
         
         print(f"\nTax: ${tax}")
@@ -284,9 +254,11 @@ class TraderGameLife:
         print(f"\nBuying {arobase_amount:.5f}@ for ${amount:.2f}")
         
         if self.ui.confirm("Confirm"):
-            self.wallet.remove_dollar(amount + tax)
-            self.wallet.add_arobase(arobase_amount)
-            print(ColorText.success(f"Bought {arobase_amount:.5f}@"))
+            result = self.engine.apply({"type": "buy", "amount": amount})
+            if result["success"]:
+                print(ColorText.success(f"Bought {result['arobase']:.5f}@"))
+            else:
+                print(ColorText.error(result["error"]))
     
     def handle_shop(self):
         """Handle shop menu"""
@@ -297,7 +269,7 @@ class TraderGameLife:
             choice = input("\nChoice: ").strip()
             
             if choice == "1":  # RTX 2080
-                result = self.wallet.buy_card("RTX_2080")
+                result = self.engine.apply({"type": "buy_card", "card_type": "RTX_2080"})
                 if result["success"]:
                     print(ColorText.success(f"Bought RTX 2080! Power: {result['power']}"))
                 else:
@@ -305,7 +277,7 @@ class TraderGameLife:
                 self.ui.pause()
             
             elif choice == "2":  # RTX 3070
-                result = self.wallet.buy_card("RTX_3070")
+                result = self.engine.apply({"type": "buy_card", "card_type": "RTX_3070"})
                 if result["success"]:
                     print(ColorText.success(f"Bought RTX 3070! Power: {result['power']}"))
                 else:
@@ -313,7 +285,7 @@ class TraderGameLife:
                 self.ui.pause()
             
             elif choice == "3":  # RTX 3090
-                result = self.wallet.buy_card("RTX_3090")
+                result = self.engine.apply({"type": "buy_card", "card_type": "RTX_3090"})
                 if result["success"]:
                     print(ColorText.success(f"Bought RTX 3090! Power: {result['power']}"))
                 else:
@@ -321,7 +293,7 @@ class TraderGameLife:
                 self.ui.pause()
             
             elif choice == "4":  # Collectible #
-                result = self.wallet.buy_collectible("hashtag")
+                result = self.engine.apply({"type": "buy_collectible", "item_type": "hashtag"})
                 if result["success"]:
                     print(ColorText.success("Bought Trophy #!"))
                 else:
@@ -329,7 +301,7 @@ class TraderGameLife:
                 self.ui.pause()
             
             elif choice == "5":  # Collectible !
-                result = self.wallet.buy_collectible("exclamation")
+                result = self.engine.apply({"type": "buy_collectible", "item_type": "exclamation"})
                 if result["success"]:
                     print(ColorText.success("Bought Pro Trader Trophy !"))
                 else:
@@ -341,7 +313,7 @@ class TraderGameLife:
                 self.ui.pause()
             
             elif choice == "7" and not self.wallet.victory_purchased:  # Victory
-                result = self.wallet.buy_victory()
+                result = self.engine.apply({"type": "buy_victory"})
                 if result["success"]:
                     print(ColorText.success("🎉 VICTORY PURCHASED! 🎉"))
                     self.ui.pause()
@@ -374,7 +346,7 @@ class TraderGameLife:
         card_type = card_map.get(choice)
         
         if card_type:
-            result = self.wallet.sell_card(card_type)
+            result = self.engine.apply({"type": "sell_card", "card_type": card_type})
             if result["success"]:
                 print(ColorText.success(f"Sold for ${result['amount']}"))
             else:
@@ -406,13 +378,13 @@ class TraderGameLife:
                     print("\n(Enter secret code or press Enter)")
                     secret = input("Code: ").strip()
                 
-                result = self.mining_manager.join_pool(pool_map[choice], secret)
+                result = self.engine.apply({"type": "join_pool", "pool_id": pool_map[choice],
+                                            "secret_code": secret})
                 
                 if result["success"]:
                     print(ColorText.success(f"Joined {result['pool']}!"))
                     
                     if "welcome_bonus" in result:
-                        self.wallet.add_dollar(result["welcome_bonus"])
                         print(ColorText.success(result["message"]))
                 else:
                     print(ColorText.error(result["error"]))
@@ -420,7 +392,7 @@ class TraderGameLife:
                 self.ui.pause()
             
             elif choice == "8":
-                self.mining_manager.leave_pool()
+                self.engine.apply({"type": "leave_pool"})
                 print(ColorText.success("Left pool"))
                 self.ui.pause()
             
@@ -461,35 +433,23 @@ class TraderGameLife:
             return
         
         if self.ui.confirm("Confirm"):
-            # Deduct from wallet
-            if currency_type == "dollar":
-                self.wallet.remove_dollar(amount)
-            else:
-                self.wallet.remove_arobase(amount)
-            
-            # Create exchange code
-            code = self.exchange_manager.create_exchange_code(
-                int(amount),
-                currency_type,
-                self.session.game_name
-            )
+            result = self.engine.apply({"type": "send", "currency_type": currency_type,
+                                        "amount": amount})
             
-            if code:
-                self.exchange_manager.display_exchange_code(code)
+            if result["success"]:
+                if result["code"]:
+                    self.exchange_manager.display_exchange_code(result["code"])
+            else:
+                print(ColorText.error(result["error"]))
     
     def handle_receive_exchange(self):
         """Handle receiving exchange"""
         print("\nEnter exchange code:")
         code_str = input("Code: ").strip()
         
-        result = self.exchange_manager.receive_exchange(code_str)
+        result = self.engine.apply({"type": "receive", "code": code_str})
         
         if result["success"]:
-            if result["currency_type"] == "dollar":
-                self.wallet.add_dollar(result["amount"])
-            else:
-                self.wallet.add_arobase(result["amount"])
-            
             print(ColorText.success(
                 f"Received {result['amount']} {result['currency_type'].upper()}!"
             ))
@@ -503,12 +463,26 @@ class TraderGameLife:
         self.ui.display_chart(self.market)
         self.ui.pause()
     
+    def handle_pepe(self):
+        """Handle the Pepe quiz"""
+        if not PepeEvent.ask_ready():
+            self.engine.apply({"type": "pepe_answer"})
+            return
+        
+        result = self.engine.apply({"type": "pepe_start"})
+        print(f"\nQuestion: {result['question']}")
+        
+        result = self.engine.apply({"type": "pepe_answer", "answer": input("Your answer: ")})
+        PepeEvent.display_result({"success": result["correct"], "valid": result["valid"]})
+    
     def handle_info(self):
         """Handle info/save menu"""
         print("\nINFO & SAVE:")
         print("  [1] Save game")
         print("  [2] Game status")
         print("  [3] Statistics")
+        if self.profiler:
+            print("  [4] Performance")
         
         choice = input("\nChoice: ").strip()
         
@@ -521,6 +495,9 @@ class TraderGameLife:
         elif choice == "3":
             self.display_statistics()
             self.ui.pause()
+        elif choice == "4" and self.profiler:
+            self.profiler.display()
+            self.ui.pause()
     
     def display_statistics(self):
         """Display detailed statistics"""
@@ -554,23 +531,12 @@ class TraderGameLife:
     
     def check_game_over_conditions(self):
         """Check if game should end"""
-        # Bankruptcy
-        if self.wallet.dollar < 0:
-            self.end_game(reason="Bankruptcy - Negative balance")
-            return True
-        
-        # Time/turn limit
-        if self.session.is_game_over():
-            reason = "Time limit reached" if self.session.is_time_expired() else "Turn limit reached"
-            self.end_game(reason=reason)
-            return True
-        
-        # Victory condition
-        if self.wallet.victory_purchased:
-            self.end_game(victory=True)
-            return True
+        game_over = self.engine.check_game_over()
+        if game_over is None:
+            return False
         
-        return False
+        self.end_game(reason=game_over["reason"], victory=game_over["victory"])
+        return True
     
     def end_game(self, reason="Game ended", victory=False):
         """End game and show final screen"""
@@ -581,25 +547,38 @@ class TraderGameLife:
         """Main game loop"""
         self.running = True
         
+        profiler = self.profiler
+        
         while self.running:
+            if profiler is not None:
+                profiler.start("frame", turn=self.market.current_turn)
+            
             # Auto-save
             if self.auto_save:
                 self.auto_save.auto_save(
                     self.session.game_name,
-                    {
-                        "session": self.session.to_dict(),
-                        "market": self.market.to_dict(),
-                        "wallet": self.wallet.to_dict(),
-                        "mining": self.mining_manager.to_dict()
-                    },
-                    time.time()
+                    self.save_data,
+                    time.time(),
+                    self.engine.journal,
+                    self.market.history,
+                    self.engine.generation,
+                    self.engine.catalog_info,
+                    frozen=True
                 )
+            if profiler is not None:
+                profiler.mark("auto_save")
             
             # Check game over
-            if self.check_game_over_conditions():
+            game_over = self.check_game_over_conditions()
+            if profiler is not None:
+                profiler.mark("game_over")
+                profiler.end()
+            if game_over:
                 break
             
             # Display status
+            if profiler is not None:
+                profiler.start("frame", turn=self.market.current_turn)
             self.ui.clear_screen()
             self.ui.display_market_status(self.market, self.wallet)
             self.ui.display_main_menu()
@@ -608,6 +587,9 @@ class TraderGameLife:
                 print(ColorText.info("[PEPE] Pepe the Frog appeared!"))
             
             self.ui.print_separator()
+            if profiler is not None:
+                profiler.mark("redraw")
+                profiler.end()
             
             # Get action
             action = input("Action: ").strip().lower()
@@ -618,12 +600,19 @@ class TraderGameLife:
             elif action == "a":
                 self.handle_buy_arobase()
             elif action == "e":
-                self.wallet.cancel_sale()
+                self.engine.apply({"type": "cancel"})
                 print(ColorText.success("Sale cancelled"))
                 self.ui.pause()
             elif action == "m":
                 self.process_turn()
                 self.ui.pause()
+            elif action.startswith("m") and action[1:].strip().isdigit():
+                summary = self.fast_forward(int(action[1:].strip()))
+                if summary["success"]:
+                    self.display_fast_forward(summary)
+                else:
+                    print(ColorText.error(summary["error"]))
+                self.ui.pause()
             elif action == "c":
                 self.handle_shop()
             elif action == "p":
@@ -635,9 +624,7 @@ class TraderGameLife:
             elif action == "i":
                 self.handle_info()
             elif action == "pepe" and self.pepe_available:
-                result = PepeEvent.trigger_pepe(self.market.current_course)
-                self.wallet.dollar *= result["multiplier"]
-                self.pepe_available = False
+                self.handle_pepe()
                 self.ui.pause()
             elif action == "q":
                 if self.ui.confirm("Save before quitting?"):
@@ -646,18 +633,29 @@ class TraderGameLife:
             else:
                 print("Invalid action")
                 self.ui.pause()
+        
+        self.close()
+    
+    def close(self):
+        """Finish the queued saves and close files (quit, game over, Ctrl-C)"""
+        if self.auto_save is not None and not self.auto_save.close():
+            print(ColorText.error("The last auto-save failed"))
+        if self.profiler is not None:
+            self.profiler.close()
 
 
-def main_menu():
+def main_menu(game=None):
     """Main menu"""
-    game = TraderGameLife()
+    game = game or TraderGameLife()
     ui = TerminalUI()
     
     ui.clear_screen()
     ui.print_header("TRADER GAME LIFE")
     print("A cryptocurrency trading and mining simulation game\n")
     
-    # Check for existing saves
+    # Repair the saves interrupted by a crash, then check for existing saves
+    for name in game.save_manager.recover_all():
+        print(ColorText.warning(f"Recovered {name} after an interrupted save"))
     saves = game.save_manager.list_saves()
     
     if saves:
@@ -677,7 +675,9 @@ def main_menu():
         elif choice == "2":
             print("\nAvailable saves:")
             for i, save in enumerate(saves, 1):
-                print(f"  [{i}] {save['name']} - {save['saved_at']}")
+                details = f" - turn {save['turn']}, score {save['score']}" \
+                    if save["turn"] is not None else ""
+                print(f"  [{i}] {save['name']} - {save['saved_at']}{details}")
             
             save_num = int(ui.get_input("\nSelect save: ")) - 1
             if 0 <= save_num < len(saves):
@@ -728,11 +728,15 @@ def start_new_game(game):
 
 
 def start_game():
+    game = TraderGameLife()
     try:
-        main_menu()
+        main_menu(game)
     except KeyboardInterrupt:
         print("\n\nGame interrupted. Goodbye!")
     except Exception as e:
         print(f"\nAn error occurred: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Auto-saves already queued are written before exiting
+        game.close()
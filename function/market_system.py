@@ -5,24 +5,183 @@ Based on seed for synchronized multiplayer
 
 import random
 import json
+import base64
+import sys
+from array import array
+from collections import deque, OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, batch APIs fall back to array('d')
+    np = None
+
+
+class DigitStream:
+    """Seekable source of the digit blocks behind the market course
+    
+    The course is read out of the decimal digits of a huge number built
+    from the seed. Each number is built once per source turn and kept as
+    a list of k-digit blocks, so any block can be read back in O(1).
+    """
+    
+    BLOCK_SIZE = 4  # Digits read per turn
+    WINDOW = 500  # Last digit offset read before the number is rebuilt
+    LIMIT = 10 ** 700
+    
+    def __init__(self, seed, max_sources=64):
+        self.seed = seed
+        self.max_sources = max_sources
+        self._blocks = OrderedDict()
+    
+    def generate_number(self, turn):
+        """Generate the large number for a source turn"""
+        nb = self.seed
+        t = 1
+        step = 1 + turn * self.seed
+        while nb < self.LIMIT:
+            t += step
+            nb = nb * t
+        return nb
+    
+    def blocks(self, source_turn):
+        """Get the digit blocks of a source turn (one per offset step)"""
+        blocks = self._blocks.get(source_turn)
+        if blocks is not None:
+            self._blocks.move_to_end(source_turn)
+        else:
+            nb_str = str(self.generate_number(source_turn))
+            blocks = []
+            for t in range(0, self.WINDOW + 1, self.BLOCK_SIZE):
+                fin = 0
+                for tt in range(self.BLOCK_SIZE):
+                    if t + tt < len(nb_str):
+                        fin += int(nb_str[t + tt]) * (10 ** tt)
+                blocks.append(fin)
+            self._blocks[source_turn] = blocks
+            if len(self._blocks) > self.max_sources:
+                self._blocks.popitem(last=False)
+        return blocks
+    
+    def block(self, source_turn, offset):
+        """Get the block starting at a digit offset of a source turn"""
+        return self.blocks(source_turn)[offset // self.BLOCK_SIZE]
+
+
+class CourseCache:
+    """Bounded LRU cache of generated course values
+    
+    Turns are grouped in blocks of BLOCK_TURNS (one digit window) and
+    whole blocks are evicted together, least recently used first, once
+    the memory budget is reached.
+    """
+    
+    BLOCK_TURNS = 125  # DigitStream.WINDOW // DigitStream.BLOCK_SIZE
+    MISSING = -2 ** 31
+    
+    def __init__(self, memory_budget=256 * 1024):
+        self.memory_budget = memory_budget
+        self.blocks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._turns = 0
+    
+    @classmethod
+    def block_bytes(cls):
+        """Approximate memory used by one block"""
+        return sys.getsizeof(array('i', [0] * cls.BLOCK_TURNS)) + 100
+    
+    def max_blocks(self):
+        """Number of blocks the budget allows (at least one chunk fill)"""
+        return max(4, self.memory_budget // self.block_bytes())
+    
+    def __len__(self):
+        return self._turns
+    
+    def __contains__(self, turn):
+        block = self.blocks.get(turn // self.BLOCK_TURNS)
+        return block is not None and block[turn % self.BLOCK_TURNS] != self.MISSING
+    
+    def __setitem__(self, turn, value):
+        key = turn // self.BLOCK_TURNS
+        block = self.blocks.get(key)
+        if block is None:
+            block = array('i', [self.MISSING]) * self.BLOCK_TURNS
+            self.blocks[key] = block
+            while len(self.blocks) > self.max_blocks():
+                _, evicted = self.blocks.popitem(last=False)
+                self._turns -= sum(1 for v in evicted if v != self.MISSING)
+                self.evictions += 1
+        else:
+            self.blocks.move_to_end(key)
+        
+        if block[turn % self.BLOCK_TURNS] == self.MISSING:
+            self._turns += 1
+        block[turn % self.BLOCK_TURNS] = value
+    
+    def get(self, turn, default=None):
+        """Get a cached value without counting a lookup"""
+        if turn in self:
+            return self.blocks[turn // self.BLOCK_TURNS][turn % self.BLOCK_TURNS]
+        return default
+    
+    def lookup(self, turn):
+        """Get a cached value (None on miss), counting hits and misses"""
+        key = turn // self.BLOCK_TURNS
+        block = self.blocks.get(key)
+        if block is not None and block[turn % self.BLOCK_TURNS] != self.MISSING:
+            self.blocks.move_to_end(key)
+            self.hits += 1
+            return block[turn % self.BLOCK_TURNS]
+        self.misses += 1
+        return None
+    
+    def clear(self):
+        """Drop every block"""
+        self.blocks.clear()
+        self._turns = 0
+    
+    def get_stats(self):
+        """Get cache counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "blocks": len(self.blocks),
+            "turns": self._turns,
+            "bytes": len(self.blocks) * self.block_bytes(),
+            "memory_budget": self.memory_budget
+        }
 
 
 class MarketGenerator:
-    """Generates deterministic market course based on seed"""
+    """Generates deterministic market course based on seed
     
-    def __init__(self, seed, variation_range=50):
+    By default the course of a turn only depends on the seed and the turn,
+    so any turn can be read directly. It matches the course a game played
+    from turn 0 has always seen. legacy=True replays the old cache-driven
+    generation exactly, including its chunk boundaries.
+    """
+    
+    VERSION = 1  # Bump when the generated course changes
+    CHUNK_BEFORE = 100  # Turns generated before a cache miss
+    CHUNK_AFTER = 100  # Turns generated after a cache miss
+    
+    def __init__(self, seed, variation_range=50, legacy=False, use_store=True,
+                 cache_budget=256 * 1024):
         self.seed = seed
         self.variation_range = variation_range
-        self.course_cache = {}
+        self.legacy = legacy
+        self.use_store = use_store
+        self.digits = DigitStream(seed)
+        self.course_cache = CourseCache(cache_budget)
+        self._cycle = None
         
     def _generate_number(self, seed_val, turn):
         """Generate a large number deterministically"""
-        nb = seed_val
-        t = 1
-        while nb < 10**700:
-            t += 1 + turn * seed_val
-            nb = nb * t
-        return nb
+        if seed_val == self.seed:
+            return self.digits.generate_number(turn)
+        return DigitStream(seed_val).generate_number(turn)
     
     def _round_value(self, value):
         """Round value with 0.5 threshold"""
@@ -30,12 +189,17 @@ class MarketGenerator:
             value += 1
         return int(value)
     
+    def _scale(self, fin, min_val, difference):
+        """Scale a digit block to a course variation"""
+        scaled = (fin * difference) / (10 ** self.digits.BLOCK_SIZE)
+        return self._round_value(scaled) + min_val
+    
     def generate_course_chunk(self, start_turn, end_turn, min_val, max_val):
         """Generate course values for a range of turns"""
         difference = max_val - min_val
-        k = 4  # Precision factor
+        k = self.digits.BLOCK_SIZE
         
-        nb_str = str(self._generate_number(self.seed, 1))
+        source = 1
         t = 0
         
         for turn in range(start_turn, end_turn + 1):
@@ -43,35 +207,608 @@ class MarketGenerator:
                 continue
                 
             t += k
-            if t > 500:
+            if t > self.digits.WINDOW:
                 t = 0
-                nb_str = str(self._generate_number(self.seed, turn))
-            
-            # Extract k digits from the string
-            fin = 0
-            for tt in range(k):
-                if t + tt < len(nb_str):
-                    fin += int(nb_str[t + tt]) * (10 ** tt)
+                source = turn
             
-            # Scale to range
-            scaled = (fin * difference) / (10 ** k)
-            course_value = self._round_value(scaled) + min_val
-            
-            self.course_cache[turn] = course_value
+            fin = self.digits.block(source, t)
+            self.course_cache[turn] = self._scale(fin, min_val, difference)
+    
+    def get_cycle(self):
+        """Get the repeating course variations of a game played from turn 0
+        
+        Filling the cache from each miss restarts the digit offset at the
+        first uncached turn, so played in order the course never leaves the
+        first source number and repeats every CHUNK_AFTER + 1 turns.
+        Read from the precomputed course store when the seed is in it.
+        """
+        if self._cycle is None and self.use_store:
+            self._cycle = self._load_stored_cycle()
+        
+        if self._cycle is None:
+            min_val = -self.variation_range
+            difference = self.variation_range + 50 - min_val
+            k = self.digits.BLOCK_SIZE
+            self._cycle = [
+                self._scale(self.digits.block(1, step * k), min_val, difference)
+                for step in range(1, self.CHUNK_AFTER + 2)
+            ]
+        return self._cycle
+    
+    def _load_stored_cycle(self):
+        """Get the cycle from the default course store, None if not stored"""
+        try:
+            from function.course_store import CourseStore
+        except ImportError:
+            return None
+        
+        store = CourseStore.get_default(self.variation_range)
+        if store is None:
+            return None
+        return store.load_cycle(self.seed, self.variation_range)
     
     def get_course(self, turn):
         """Get course value for a specific turn"""
-        if turn not in self.course_cache:
-            # Generate chunk if not cached
-            self.generate_course_chunk(max(1, turn - 100), turn + 100, 
-                                       -self.variation_range, 
-                                       self.variation_range + 50)
+        if not self.legacy:
+            if turn < 1:
+                return 70
+            cycle = self.get_cycle()
+            return cycle[(turn - 1) % len(cycle)]
+        
+        value = self.course_cache.lookup(turn)
+        if value is not None:
+            return value
+        
+        # Generate chunk if not cached
+        self.generate_course_chunk(max(1, turn - self.CHUNK_BEFORE),
+                                   turn + self.CHUNK_AFTER,
+                                   -self.variation_range, 
+                                   self.variation_range + 50)
         return self.course_cache.get(turn, 70)
+    
+    def get_cache_stats(self):
+        """Get course cache counters (legacy generation only uses the cache)"""
+        return self.course_cache.get_stats()
+    
+    def generate_course_array(self, start_turn, end_turn):
+        """Get the course variations of turns start_turn..end_turn (inclusive)
+        
+        Returns a NumPy float array, or array('d') when NumPy is missing.
+        """
+        count = max(0, end_turn - start_turn + 1)
+        
+        if self.legacy:
+            values = [self.get_course(turn) for turn in range(start_turn, end_turn + 1)]
+            return np.array(values, dtype=float) if np is not None else array('d', values)
+        
+        cycle = self.get_cycle()
+        period = len(cycle)
+        
+        if np is not None:
+            turns = np.arange(start_turn, start_turn + count)
+            result = np.asarray(cycle, dtype=float)[(turns - 1) % period]
+            result[turns < 1] = 70
+            return result
+        
+        result = array('d')
+        turn = start_turn
+        while turn < 1 and turn <= end_turn:
+            result.append(70)
+            turn += 1
+        if turn <= end_turn:
+            offset = (turn - 1) % period
+            remaining = end_turn - turn + 1
+            result.extend(cycle[offset:offset + remaining])
+            remaining -= period - offset
+            if remaining > 0:
+                repeats, extra = divmod(remaining, period)
+                result.extend(array('d', cycle) * repeats)
+                result.extend(cycle[:extra])
+        return result
+
+
+def pack_floats(values):
+    """Encode an array('d') as base64 of little-endian doubles"""
+    values = array('d', values)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def unpack_floats(text):
+    """Decode base64 little-endian doubles into an array('d')"""
+    values = array('d')
+    values.frombytes(base64.b64decode(text))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+class CourseHistory:
+    """Course of every turn stored in one contiguous array('d')
+    
+    Indexed by turn with an offset. Reads like the {turn: course} dict it
+    replaces (history[turn], turn in history, keys/values/items) and saves
+    as a single base64 buffer instead of one JSON key per turn.
+    """
+    
+    def __init__(self, values=(), start_turn=0):
+        self.start_turn = start_turn
+        self._values = array('d', values)
+    
+    @property
+    def end_turn(self):
+        """Turn after the last stored turn"""
+        return self.start_turn + len(self._values)
+    
+    def __len__(self):
+        return len(self._values)
+    
+    def __contains__(self, turn):
+        return isinstance(turn, int) and self.start_turn <= turn < self.end_turn
+    
+    def __getitem__(self, turn):
+        if turn not in self:
+            raise KeyError(turn)
+        return self._values[turn - self.start_turn]
+    
+    def __setitem__(self, turn, value):
+        if turn == self.end_turn:
+            self._values.append(value)
+        elif turn in self:
+            self._values[turn - self.start_turn] = value
+        else:
+            raise KeyError(f"History turns must be contiguous (turn {turn})")
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def get(self, turn, default=None):
+        """Get the course of a turn, or default"""
+        if turn in self:
+            return self._values[turn - self.start_turn]
+        return default
+    
+    def append(self, value):
+        """Store the course of the next turn"""
+        self._values.append(value)
+    
+    def extend(self, values):
+        """Store the courses of the next turns"""
+        self._values.extend(values)
+    
+    def keys(self):
+        """Stored turns"""
+        return range(self.start_turn, self.end_turn)
+    
+    def values(self):
+        """Stored courses (read-only use)"""
+        return self._values
+    
+    def items(self):
+        """(turn, course) pairs"""
+        return zip(self.keys(), self._values)
+    
+    def tail(self, count):
+        """Courses of the last `count` turns"""
+        if count <= 0:
+            return self._values[:0]
+        return self._values[-count:]
+    
+    def to_dict(self):
+        """Convert to dictionary for saving"""
+        return {
+            "start_turn": self.start_turn,
+            "values": pack_floats(self._values)
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create history from a saved buffer or a legacy {turn: course} dict"""
+        if isinstance(data.get("values"), str):
+            return cls(unpack_floats(data["values"]), int(round(data.get("start_turn", 0))))
+        if isinstance(data.get("values"), array):
+            return cls(data["values"], int(round(data.get("start_turn", 0))))
+        
+        # Older saves stored one key per turn
+        turns = sorted(int(k) for k in data)
+        if not turns:
+            return cls()
+        if turns[-1] - turns[0] + 1 != len(turns):
+            raise ValueError("Market history has missing turns")
+        
+        return cls((data[k] for k in sorted(data, key=int)), turns[0])
+
+
+class CandlePyramid:
+    """Open/high/low/close candles of the course at several resolutions
+    
+    Candle i of a level covers `size` turns starting at
+    start_turn + i * size; the last candle of each level is still open.
+    Each candle also keeps the total of its courses for range averages.
+    The 1-turn level is the history itself.
+    """
+    
+    SIZES = (10, 100, 1000)
+    FIELDS = ("open", "high", "low", "close", "total")
+    BULK_VALUES = 1000  # extend() uses NumPy from this many values
+    
+    def __init__(self, start_turn=0, sizes=SIZES):
+        self.start_turn = start_turn
+        self.levels = {size: {field: array('d') for field in self.FIELDS}
+                       for size in sizes}
+    
+    def add(self, turn, value):
+        """Add the course of the next turn in O(levels)"""
+        offset = turn - self.start_turn
+        for size, candles in self.levels.items():
+            if offset // size == len(candles["open"]):
+                candles["open"].append(value)
+                candles["high"].append(value)
+                candles["low"].append(value)
+                candles["close"].append(value)
+                candles["total"].append(value)
+            else:
+                if value > candles["high"][-1]:
+                    candles["high"][-1] = value
+                if value < candles["low"][-1]:
+                    candles["low"][-1] = value
+                candles["close"][-1] = value
+                candles["total"][-1] += value
+    
+    def extend(self, turn, values):
+        """Add the courses of consecutive turns starting at `turn`"""
+        offset = turn - self.start_turn
+        for size, candles in self.levels.items():
+            i = 0
+            # Finish the open candle one value at a time
+            if offset % size and candles["open"]:
+                while i < len(values) and (offset + i) % size:
+                    value = values[i]
+                    if value > candles["high"][-1]:
+                        candles["high"][-1] = value
+                    if value < candles["low"][-1]:
+                        candles["low"][-1] = value
+                    candles["close"][-1] = value
+                    candles["total"][-1] += value
+                    i += 1
+            
+            # Then whole new candles: as matrix rows for long runs
+            if np is not None and len(values) - i >= self.BULK_VALUES:
+                i = self._extend_blocks(candles, size, values, i)
+            
+            while i < len(values):
+                chunk = values[i:i + size]
+                candles["open"].append(chunk[0])
+                candles["high"].append(max(chunk))
+                candles["low"].append(min(chunk))
+                candles["close"].append(chunk[-1])
+                candles["total"].append(sum(chunk))
+                i += size
+    
+    @staticmethod
+    def _extend_blocks(candles, size, values, start):
+        """Append the whole candles of values[start:] with NumPy
+        
+        Totals are summed left to right (cumsum) like add() so they match
+        a pyramid built turn by turn.
+        
+        Returns:
+            Index of the first value left (the open candle)
+        """
+        data = np.asarray(values[start:], dtype=float)
+        full = len(data) // size * size
+        blocks = data[:full].reshape(-1, size)
+        columns = {
+            "open": blocks[:, 0],
+            "high": blocks.max(axis=1),
+            "low": blocks.min(axis=1),
+            "close": blocks[:, -1],
+            "total": blocks.cumsum(axis=1)[:, -1],
+        }
+        for field, column in columns.items():
+            candles[field].extend(column.tolist())
+        return start + full
+    
+    def candle_count(self, size):
+        """Number of candles in a level"""
+        return len(self.levels[size]["open"])
+    
+    def get_candles(self, size, first=0, last=None):
+        """
+        Get candles first..last (inclusive indexes) of a level
+        
+        Returns:
+            List of dictionaries with turn, open, high, low and close
+        """
+        candles = self.levels[size]
+        if last is None:
+            last = len(candles["open"]) - 1
+        first = max(0, first)
+        last = min(last, len(candles["open"]) - 1)
+        
+        return [{
+            "turn": self.start_turn + i * size,
+            "open": candles["open"][i],
+            "high": candles["high"][i],
+            "low": candles["low"][i],
+            "close": candles["close"][i],
+        } for i in range(first, last + 1)]
+    
+    def to_dict(self):
+        """Convert to dictionary for saving"""
+        return {
+            "start_turn": self.start_turn,
+            "levels": {
+                str(size): {field: pack_floats(values) for field, values in candles.items()}
+                for size, candles in self.levels.items()
+            }
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create pyramid from dictionary"""
+        sizes = tuple(sorted(int(size) for size in data["levels"]))
+        pyramid = cls(int(round(data.get("start_turn", 0))), sizes)
+        for size, candles in data["levels"].items():
+            pyramid.levels[int(size)] = {field: unpack_floats(candles[field])
+                                         for field in cls.FIELDS}
+        return pyramid
+    
+    @classmethod
+    def from_history(cls, history, sizes=SIZES):
+        """Build a pyramid from a full history"""
+        pyramid = cls(history.start_turn, sizes)
+        pyramid.extend(history.start_turn, history.values())
+        return pyramid
+
+
+class RunningStats:
+    """Running count, mean, variance (Welford), min and max of a series"""
+    
+    def __init__(self, values=()):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        for value in values:
+            self.add(value)
+    
+    def add(self, value):
+        """Add a value in O(1)"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+    
+    def extend(self, values):
+        """add() each value (same results, without the call per value)"""
+        count, mean, m2 = self.count, self.mean, self.m2
+        low, high = self.min, self.max
+        for value in values:
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            if low is None or value < low:
+                low = value
+            if high is None or value > high:
+                high = value
+        self.count, self.mean, self.m2 = count, mean, m2
+        self.min, self.max = low, high
+    
+    def merge(self, other):
+        """Add the values tracked by another RunningStats (parallel Welford)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def variance(self):
+        """Population variance"""
+        if self.count == 0:
+            return 0.0
+        return self.m2 / self.count
+    
+    def std(self):
+        """Population standard deviation"""
+        return self.variance() ** 0.5
+    
+    def to_dict(self):
+        """Convert to dictionary for saving"""
+        return {"count": self.count, "mean": self.mean, "m2": self.m2,
+                "min": self.min, "max": self.max}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create statistics from dictionary"""
+        stats = cls()
+        stats.count = int(round(data["count"]))
+        stats.mean = data["mean"]
+        stats.m2 = data["m2"]
+        stats.min = data["min"]
+        stats.max = data["max"]
+        return stats
+
+
+class RollingTrend:
+    """Linear regression of the course over the last `window` turns
+    
+    Sums are kept in integer cents over a fixed-size deque, so each turn
+    is an O(1) update with no floating drift over long games.
+    """
+    
+    def __init__(self, window, values=()):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.sum_y = 0
+        self.sum_xy = 0
+        self.sum_yy = 0
+        for value in values:
+            self.add(value)
+    
+    def add(self, value):
+        """Add the course of the next turn"""
+        y = int(round(value * 100))
+        n = len(self.values)
+        
+        if n == self.window:
+            # Drop the oldest point and shift every x down by one
+            oldest = self.values[0]
+            self.sum_y -= oldest
+            self.sum_xy -= self.sum_y
+            self.sum_yy -= oldest * oldest
+            n -= 1
+        
+        self.values.append(y)
+        self.sum_y += y
+        self.sum_xy += n * y
+        self.sum_yy += y * y
+    
+    def is_full(self):
+        """Check if the window has enough turns"""
+        return len(self.values) == self.window
+    
+    def _moments(self):
+        """Get (n * Sxx - Sx^2, n * Sxy - Sx * Sy, n * Syy - Sy^2)"""
+        n = len(self.values)
+        sum_x = n * (n - 1) // 2
+        sum_xx = (n - 1) * n * (2 * n - 1) // 6
+        return (n * sum_xx - sum_x * sum_x,
+                n * self.sum_xy - sum_x * self.sum_y,
+                n * self.sum_yy - self.sum_y * self.sum_y)
+    
+    def slope(self):
+        """Course change per turn"""
+        var_x, cov_xy, _ = self._moments()
+        if var_x == 0:
+            return 0.0
+        return cov_xy / var_x / 100
+    
+    def r2(self):
+        """Coefficient of determination of the regression"""
+        var_x, cov_xy, var_y = self._moments()
+        if var_x == 0 or var_y == 0:
+            return 0.0
+        return cov_xy * cov_xy / (var_x * var_y)
+    
+    def label(self):
+        """Trend label (rising/falling/stable)"""
+        if not self.is_full():
+            return "stable"
+        
+        slope = self.slope()
+        if slope > 1:
+            return "rising"
+        elif slope < -1:
+            return "falling"
+        else:
+            return "stable"
+
+
+class CourseCheckpoints:
+    """Market state every INTERVAL turns of a game played from turn 0
+    
+    Stores (course, previous course, max, min, RunningStats of every
+    course so far) at each checkpoint turn for one seed and starting
+    course. Checkpoints are built on demand and shared by every market
+    with the same key.
+    """
+    
+    INTERVAL = 1000  # Multiple of the largest candle size
+    
+    _registry = {}
+    
+    def __init__(self, seed, starting_course=70, variation_range=50):
+        self.seed = seed
+        self.starting_course = starting_course
+        self.variation_range = variation_range
+        self.courses = array('d', [starting_course])
+        self.previous = array('d', [starting_course])
+        self.highs = array('d', [starting_course])
+        self.lows = array('d', [starting_course])
+        self.stats = [RunningStats([starting_course]).to_dict()]
+    
+    @classmethod
+    def get(cls, seed, starting_course=70, variation_range=50):
+        """Get the shared checkpoints of a seed"""
+        key = (seed, starting_course, variation_range, MarketGenerator.VERSION)
+        checkpoints = cls._registry.get(key)
+        if checkpoints is None:
+            checkpoints = cls(seed, starting_course, variation_range)
+            cls._registry[key] = checkpoints
+        return checkpoints
+    
+    def last_turn(self):
+        """Turn of the last checkpoint built"""
+        return (len(self.courses) - 1) * self.INTERVAL
+    
+    def extend_to(self, turn):
+        """Build checkpoints up to the last one at or before `turn`"""
+        target = (turn // self.INTERVAL) * self.INTERVAL
+        if target <= self.last_turn():
+            return
+        
+        scratch = Market(self.seed, self.starting_course)
+        scratch.generator = MarketGenerator(self.seed, self.variation_range)
+        scratch.current_turn = self.last_turn()
+        scratch.current_course = self.courses[-1]
+        values = scratch.simulate_courses(target - scratch.current_turn).tolist()
+        
+        # Courses as Market.advance_turns keeps them (whole dollars above 100)
+        course = int(self.courses[-1]) if self.previous[-1] > 100 else self.courses[-1]
+        kept = [int(value) if before > 100 else value
+                for value, before in zip(values, [course] + values[:-1])]
+        
+        high = self.highs[-1]
+        low = self.lows[-1]
+        stats = RunningStats.from_dict(self.stats[-1])
+        for end in range(self.INTERVAL, len(values) + 1, self.INTERVAL):
+            block = kept[end - self.INTERVAL:end]
+            high = max(high, max(block))
+            low = min(low, min(block))
+            stats.extend(block)
+            self.courses.append(values[end - 1])
+            self.previous.append(values[end - 2])
+            self.highs.append(high)
+            self.lows.append(low)
+            self.stats.append(stats.to_dict())
+    
+    def nearest(self, turn):
+        """
+        Get the last checkpoint at or before a turn
+        
+        Returns:
+            Tuple (turn, course, previous course, max, min, statistics
+            as RunningStats.to_dict)
+        """
+        self.extend_to(turn)
+        index = min(turn // self.INTERVAL, len(self.courses) - 1)
+        return (index * self.INTERVAL, self.courses[index], self.previous[index],
+                self.highs[index], self.lows[index], self.stats[index])
 
 
 class Market:
     """Market system managing course and transactions"""
     
+    TREND_WINDOWS = (5, 20, 100)  # Windows tracked every turn
+    
     def __init__(self, seed, starting_course=70):
         self.generator = MarketGenerator(seed)
         self.current_turn = 0
@@ -80,8 +817,23 @@ class Market:
         self.previous_course = starting_course
         self.course_max = starting_course
         self.course_min = starting_course
-        self.history = {0: starting_course}
+        self.history = CourseHistory([starting_course])
+        self.stats = RunningStats(self.history.values())
+        self.candles = CandlePyramid.from_history(self.history)
+        self._reset_trends()
         
+    def _reset_trends(self):
+        """Rebuild the rolling trends from the end of the history"""
+        self.trends = {}
+        for window in self.TREND_WINDOWS:
+            self._track_trend(window)
+    
+    def _track_trend(self, window):
+        """Start tracking a trend window from the current history"""
+        trend = RollingTrend(window, self.history.tail(window))
+        self.trends[window] = trend
+        return trend
+    
     def advance_turn(self):
         """Advance to next turn and update course"""
         self.current_turn += 1
@@ -115,9 +867,170 @@ class Market:
         
         # Store in history
         self.history[self.current_turn] = self.current_course
+        self.stats.add(self.current_course)
+        self.candles.add(self.current_turn, self.current_course)
+        for trend in self.trends.values():
+            trend.add(self.current_course)
         
         return self.current_course
     
+    def seek(self, turn):
+        """
+        Jump to a turn as if the market had been played from turn 0
+        
+        Restores the nearest checkpoint at or before `turn` and replays the
+        rest, so at most CourseCheckpoints.INTERVAL turns are played. When
+        the current turn is closer, it plays forward from there and keeps
+        the history; otherwise history and candles restart at the
+        checkpoint. Max, min and the running statistics (get_statistics)
+        always cover the whole game.
+        
+        Returns:
+            Course at the turn
+        """
+        if self.generator.legacy:
+            raise ValueError("Cannot seek a legacy market generator")
+        if turn < 0:
+            raise ValueError("Turn must be positive")
+        
+        checkpoints = CourseCheckpoints.get(self.generator.seed, self.base_course,
+                                            self.generator.variation_range)
+        checkpoint = checkpoints.nearest(turn)
+        
+        if not self.current_turn <= turn <= self.current_turn + (turn - checkpoint[0]):
+            checkpoint_turn, course, previous, high, low, stats = checkpoint
+            if previous > 100:
+                course = int(course)
+            
+            self.current_turn = checkpoint_turn
+            self.current_course = course
+            self.previous_course = previous
+            self.course_max = high
+            self.course_min = low
+            self.history = CourseHistory([course], checkpoint_turn)
+            self.stats = RunningStats.from_dict(stats)
+            self.candles = CandlePyramid.from_history(self.history)
+            self._reset_trends()
+        
+        self.advance_turns(turn - self.current_turn)
+        return self.current_course
+    
+    @classmethod
+    def at_turn(cls, seed, turn, starting_course=70):
+        """Get the market of a seed as it is at a given turn"""
+        market = cls(seed, starting_course)
+        market.seek(turn)
+        return market
+    
+    def advance_turns(self, n):
+        """
+        Advance n turns at once
+        
+        Leaves the market in the same state as n calls to advance_turn.
+        
+        Returns:
+            Courses of the n turns (same types as simulate_courses)
+        """
+        courses = self.simulate_courses(n)
+        if n <= 0:
+            return courses
+        
+        # advance_turn keeps whole dollars above 100
+        values = courses.tolist()
+        previous = [self.current_course] + values[:-1]
+        values = [int(value) if before > 100 else value
+                  for value, before in zip(values, previous)]
+        
+        first_turn = self.current_turn + 1
+        if first_turn != self.history.end_turn:
+            raise KeyError(f"History turns must be contiguous (turn {first_turn})")
+        
+        self.history.extend(values)
+        self.stats.extend(values)
+        self.candles.extend(first_turn, values)
+        
+        high = max(values)
+        if high > self.course_max:
+            self.course_max = high
+        low = min(values)
+        if low < self.course_min:
+            self.course_min = low
+        
+        self.current_turn += n
+        self.previous_course = values[-2] if n > 1 else self.current_course
+        self.current_course = values[-1]
+        self._reset_trends()
+        return courses
+    
+    def simulate_courses(self, n):
+        """Simulate the course of the next n turns without advancing the market
+        
+        Applies the same decay and 100-threshold rules as advance_turn.
+        Returns a NumPy float array, or array('d') when NumPy is missing.
+        """
+        start = self.current_turn + 1
+        variations = self.generator.generate_course_array(start, start + n - 1)
+        steps = None
+        if np is not None:
+            steps = variations - np.minimum(np.arange(start, start + n) // 35, 25)
+        variations = list(variations)
+        
+        # Once the decay is capped, the next course only depends on the
+        # current one and the position in the generator cycle. A course seen
+        # twice at the same position means the rest of the run repeats.
+        period = None if self.generator.legacy else len(self.generator.get_cycle())
+        seen = {}
+        
+        courses = []
+        course = self.current_course
+        i = 0
+        while i < n:
+            turn = start + i
+            
+            if period and turn > 25 * 35 and turn % period == 1:
+                if course in seen:
+                    loop = courses[seen[course]:]
+                    repeats, extra = divmod(n - i, len(loop))
+                    courses.extend(loop * repeats)
+                    courses.extend(loop[:extra])
+                    break
+                seen[course] = i
+            
+            if course > 100 and steps is not None:
+                # Above 100 the course only adds integers: run a cumulative
+                # sum up to the next cycle boundary or the first drop to 100
+                end = n if not period else min(n, i + period - (turn - 1) % period)
+                run = int(course) + np.cumsum(steps[i:end])
+                below = np.flatnonzero(run <= 100)
+                if below.size:
+                    end = i + below[0] + 1
+                    run = run[:below[0] + 1]
+                courses.extend(run.tolist())
+                course = max(int(run[-1]), 1)
+                courses[-1] = course
+                i = end
+                continue
+            
+            temp_decay = int(turn / 35)
+            if temp_decay > 25:
+                temp_decay = 25
+            
+            if course > 100:
+                course = int(course + variations[i] - temp_decay)
+            else:
+                course += variations[i] / 10
+                course = int(course * 100) / 100
+            
+            if course < 1:
+                course = 1
+            
+            courses.append(course)
+            i += 1
+        
+        if np is not None:
+            return np.array(courses, dtype=float)
+        return array('d', courses)
+    
     def get_course_change(self):
         """Get course change from previous turn"""
         return self.current_course - self.previous_course
@@ -135,7 +1048,7 @@ class Market:
     
     def get_statistics(self):
         """Get market statistics"""
-        if len(self.history) < 2:
+        if self.stats.count < 2:
             return {
                 "max": self.course_max,
                 "min": self.course_min,
@@ -143,51 +1056,104 @@ class Market:
                 "volatility": 0
             }
         
-        total = sum(self.history.values())
-        avg = total / len(self.history)
-        
-        # Calculate volatility (standard deviation)
-        variance = sum((v - avg) ** 2 for v in self.history.values()) / len(self.history)
-        volatility = variance ** 0.5
-        
+        # Running aggregates are updated every turn, volatility is the
+        # standard deviation of the whole history
         return {
             "max": self.course_max,
             "min": self.course_min,
-            "average": round(avg, 2),
-            "volatility": round(volatility, 2)
+            "average": round(self.stats.mean, 2),
+            "volatility": round(self.stats.std(), 2)
         }
     
-    def get_trend(self, window=5):
-        """Get recent trend (positive/negative/stable)"""
-        if len(self.history) < window:
-            return "stable"
+    def get_range_statistics(self, start_turn, end_turn):
+        """
+        Get open/close/max/min/average of the course over a turn range
         
-        recent_turns = sorted(self.history.keys())[-window:]
-        recent_values = [self.history[t] for t in recent_turns]
+        Whole candles are read from the coarsest level that fits, so the
+        cost depends on the number of levels, not the range length.
         
-        # Simple linear regression slope
-        avg_turn = sum(recent_turns) / len(recent_turns)
-        avg_value = sum(recent_values) / len(recent_values)
+        Returns:
+            Dictionary of statistics, or None if the range has no turns
+        """
+        start_turn = max(start_turn, self.history.start_turn)
+        end_turn = min(end_turn, self.history.end_turn - 1)
+        if start_turn > end_turn:
+            return None
         
-        numerator = sum((recent_turns[i] - avg_turn) * (recent_values[i] - avg_value) 
-                       for i in range(len(recent_turns)))
-        denominator = sum((t - avg_turn) ** 2 for t in recent_turns)
+        sizes = sorted(self.candles.levels, reverse=True)
+        high = None
+        low = None
+        total = 0
+        turn = start_turn
+        while turn <= end_turn:
+            offset = turn - self.candles.start_turn
+            for size in sizes:
+                index = offset // size
+                count = self.candles.candle_count(size)
+                if offset % size or index >= count:
+                    continue
+                # Whole candle inside the range, or the open candle when
+                # the range reaches the current turn
+                if turn + size - 1 <= end_turn or (index == count - 1 and
+                                                   end_turn == self.history.end_turn - 1):
+                    candles = self.candles.levels[size]
+                    candle_high = candles["high"][index]
+                    candle_low = candles["low"][index]
+                    total += candles["total"][index]
+                    turn += size
+                    break
+            else:
+                candle_high = candle_low = self.history[turn]
+                total += candle_high
+                turn += 1
+            
+            if high is None or candle_high > high:
+                high = candle_high
+            if low is None or candle_low < low:
+                low = candle_low
         
-        if denominator == 0:
-            return "stable"
+        count = end_turn - start_turn + 1
+        return {
+            "start": start_turn,
+            "end": end_turn,
+            "open": self.history[start_turn],
+            "close": self.history[end_turn],
+            "max": high,
+            "min": low,
+            "average": total / count
+        }
+    
+    def get_trend(self, window=5):
+        """Get recent trend (rising/falling/stable)"""
+        return self.get_trend_details(window)["trend"]
+    
+    def get_trend_details(self, window=5):
+        """
+        Get the regression over the last `window` turns
         
-        slope = numerator / denominator
+        Returns:
+            Dictionary with trend label, slope (course per turn) and r2
+        """
+        trend = self.trends.get(window)
+        if trend is None:
+            trend = self._track_trend(window)
         
-        if slope > 1:
-            return "rising"
-        elif slope < -1:
-            return "falling"
-        else:
-            return "stable"
-    
-    def to_dict(self):
-        """Convert to dictionary for saving"""
         return {
+            "window": window,
+            "trend": trend.label(),
+            "slope": trend.slope(),
+            "r2": trend.r2()
+        }
+    
+    def to_dict(self, history=True):
+        """
+        Convert to dictionary for saving
+        
+        Args:
+            history: False leaves out the history and candles (saved
+                     apart, candles are rebuilt on load)
+        """
+        data = {
             "seed": self.generator.seed,
             "current_turn": self.current_turn,
             "base_course": self.base_course,
@@ -195,19 +1161,36 @@ class Market:
             "previous_course": self.previous_course,
             "course_max": self.course_max,
             "course_min": self.course_min,
-            "history": self.history
+            "stats": self.stats.to_dict(),
         }
+        if history:
+            data["history"] = self.history.to_dict()
+            data["candles"] = self.candles.to_dict()
+        return data
     
     @classmethod
     def from_dict(cls, data):
         """Create market from dictionary"""
-        market = cls(data["seed"], data["base_course"])
-        market.current_turn = data["current_turn"]
+        # Encoded saves decode every number as a float
+        market = cls(int(round(data["seed"])), data["base_course"])
+        market.current_turn = int(round(data["current_turn"]))
         market.current_course = data["current_course"]
         market.previous_course = data["previous_course"]
         market.course_max = data["course_max"]
         market.course_min = data["course_min"]
-        market.history = {int(k): v for k, v in data["history"].items()}
+        market.history = CourseHistory.from_dict(data["history"])
+        # Saved statistics cover at least the history (the whole game
+        # after a cold seek, whose history restarts at a checkpoint)
+        stats = data.get("stats")
+        if stats is not None and int(round(stats["count"])) >= len(market.history):
+            market.stats = RunningStats.from_dict(stats)
+        else:
+            market.stats = RunningStats(market.history.values())
+        if "candles" in data:
+            market.candles = CandlePyramid.from_dict(data["candles"])
+        else:
+            market.candles = CandlePyramid.from_history(market.history)
+        market._reset_trends()
         return market
 
 
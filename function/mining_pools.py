@@ -14,6 +14,7 @@ class MiningPool:
         self.name = name
         self.description = description
         self.cooldown_turns = 10  # Turns before can switch
+        self.rng = random  # Set by MiningManager.use_random
     
     def get_bonus(self, power, gain):
         """Get mining bonus for this pool"""
@@ -44,7 +45,7 @@ class NoPool(MiningPool):
     
     def get_bonus(self, power, gain):
         # Rare chance to get big reward when solo
-        if random.randint(1, 200) == 1:
+        if self.rng.randint(1, 200) == 1:
             jackpot = round((1000000 / 70) * 1000) / 1000
             return {"arobase": jackpot, "dollar": 0, "message": "🎰 SOLO JACKPOT!"}
         return {"arobase": 0, "dollar": 0}
@@ -164,7 +165,7 @@ class PlusPlusPool(MiningPool):
 class MiningManager:
     """Manages mining operations and pool membership"""
     
-    def __init__(self):
+    def __init__(self, rng=None):
         self.pools = {
             "SOLO": NoPool(),
             "C53": C53Pool(),
@@ -179,6 +180,13 @@ class MiningManager:
         self.current_pool = None
         self.cooldown_remaining = 0
         self.its_plus_unlocked = False
+        self.use_random(rng or random)
+    
+    def use_random(self, rng):
+        """Draw sales and pool luck from `rng` (a random.Random)"""
+        self.rng = rng
+        for pool in self.pools.values():
+            pool.rng = rng
     
     def get_available_pools(self):
         """Get list of available pools"""
@@ -274,7 +282,7 @@ class MiningManager:
         """Process arobase sale through pool"""
         if not self.current_pool:
             # Random sale 70-100%
-            sold = random.randint(int(arobase_for_sale * 0.7), int(arobase_for_sale))
+            sold = self.rng.randint(int(arobase_for_sale * 0.7), int(arobase_for_sale))
             return sold
         
         pool = self.pools[self.current_pool]
@@ -284,7 +292,7 @@ class MiningManager:
             return arobase_for_sale  # All sold instantly
         else:
             # Random sale 70-100%
-            sold = random.randint(int(arobase_for_sale * 0.7), int(arobase_for_sale))
+            sold = self.rng.randint(int(arobase_for_sale * 0.7), int(arobase_for_sale))
             return sold
     
     def get_market_alerts(self, current_course, course_max, course_min):
@@ -0,0 +1,204 @@
+"""
+Multi Market - Many tradable coins driven by one vectorized generator
+Every coin follows the same rules as the single "@" market
+"""
+
+import random
+from array import array
+
+from function.market_system import MarketGenerator, pack_floats, unpack_floats
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, coins are then stepped one by one
+    np = None
+
+
+def derive_seed(seed, index):
+    """Derive the seed of coin `index` from the game seed ("@" keeps it)"""
+    if index == 0:
+        return seed
+    return random.Random(f"{seed}:{index}").randint(10000, 99999)
+
+
+def derive_variation_range(seed, index, base_range=50):
+    """Derive the variation range of coin `index` ("@" keeps the base)"""
+    if index == 0:
+        return base_range
+    return random.Random(f"{seed}:{index}:range").randint(base_range // 2, base_range * 2)
+
+
+class MultiMarket:
+    """Market of several coins advanced together
+    
+    Each coin has its own seed, variation range and course, and moves
+    exactly like a Market with the same settings. All coins are stepped
+    at once over NumPy arrays, so 50 coins cost about as much as one.
+    """
+    
+    def __init__(self, seed, coin_count=10, starting_course=70, coins=None):
+        """
+        Args:
+            seed: Game seed ("@" uses it as is)
+            coin_count: Number of coins when `coins` is not given
+            starting_course: Starting course of every coin
+            coins: Optional list of {"symbol", "seed", "variation_range"}
+        """
+        if coins is None:
+            coins = [{
+                "symbol": "@" if i == 0 else f"@{i}",
+                "seed": derive_seed(seed, i),
+                "variation_range": derive_variation_range(seed, i),
+            } for i in range(coin_count)]
+        
+        self.seed = seed
+        self.coins = coins
+        self.symbols = [coin["symbol"] for coin in coins]
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.base_course = starting_course
+        self.current_turn = 0
+        
+        cycles = [MarketGenerator(coin["seed"], coin["variation_range"]).get_cycle()
+                  for coin in coins]
+        self.period = len(cycles[0])
+        
+        if np is not None:
+            # Row r holds the variation of every coin at cycle position r
+            self._cycles = np.array(cycles, dtype=float).T.copy()
+            self.current = np.full(len(coins), float(starting_course))
+            self.previous = self.current.copy()
+            self.course_max = self.current.copy()
+            self.course_min = self.current.copy()
+        else:
+            self._cycles = [array('d', column) for column in zip(*cycles)]
+            self.current = array('d', [starting_course] * len(coins))
+            self.previous = array('d', self.current)
+            self.course_max = array('d', self.current)
+            self.course_min = array('d', self.current)
+        
+        # Courses of every coin, one row per turn from turn 0
+        self.history = array('d', self.current)
+    
+    def advance_turn(self):
+        """Advance every coin to the next turn"""
+        self.current_turn += 1
+        variations = self._cycles[(self.current_turn - 1) % self.period]
+        
+        temp_decay = int(self.current_turn / 35)
+        if temp_decay > 25:
+            temp_decay = 25
+        
+        if np is not None:
+            course = self.current
+            high = course > 100
+            course = np.where(high,
+                              np.trunc(course + (variations - temp_decay)),
+                              np.trunc((course + variations / 10) * 100) / 100)
+            np.maximum(course, 1, out=course)
+            self.previous = self.current
+            self.current = course
+            np.maximum(self.course_max, course, out=self.course_max)
+            np.minimum(self.course_min, course, out=self.course_min)
+        else:
+            self.previous = array('d', self.current)
+            for i, variation in enumerate(variations):
+                course = self.current[i]
+                if course > 100:
+                    course = int(course + (variation - temp_decay))
+                else:
+                    course += variation / 10
+                    course = int(course * 100) / 100
+                if course < 1:
+                    course = 1
+                self.current[i] = course
+                if course > self.course_max[i]:
+                    self.course_max[i] = course
+                if course < self.course_min[i]:
+                    self.course_min[i] = course
+        
+        if np is not None:
+            self.history.frombytes(self.current.tobytes())
+        else:
+            self.history.extend(self.current)
+        return self.current
+    
+    def advance_turns(self, n):
+        """Advance every coin n turns"""
+        for _ in range(n):
+            self.advance_turn()
+        return self.current
+    
+    def get_course(self, symbol):
+        """Get the current course of a coin"""
+        return float(self.current[self.index[symbol]])
+    
+    def get_courses(self):
+        """Get the current course of every coin"""
+        return {symbol: float(self.current[i]) for i, symbol in enumerate(self.symbols)}
+    
+    def get_course_change(self, symbol):
+        """Get the course change of a coin from the previous turn"""
+        i = self.index[symbol]
+        return float(self.current[i] - self.previous[i])
+    
+    def get_history(self, symbol):
+        """Get the course history of a coin as a list"""
+        i = self.index[symbol]
+        return self.history[i::len(self.symbols)].tolist()
+    
+    def calculate_buy_amount(self, symbol, dollars, tax=0):
+        """Calculate how much of a coin can be bought with dollars"""
+        if dollars <= tax:
+            return 0
+        return (dollars - tax) / self.get_course(symbol)
+    
+    def calculate_sell_value(self, symbol, amount):
+        """Calculate dollar value of an amount of a coin"""
+        return amount * self.get_course(symbol)
+    
+    def to_dict(self):
+        """Convert to dictionary for saving"""
+        return {
+            "seed": self.seed,
+            "coins": self.coins,
+            "base_course": self.base_course,
+            "current_turn": self.current_turn,
+            "current": list(map(float, self.current)),
+            "previous": list(map(float, self.previous)),
+            "course_max": list(map(float, self.course_max)),
+            "course_min": list(map(float, self.course_min)),
+            "history": pack_floats(self.history)
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create multi market from dictionary"""
+        coins = [{
+            "symbol": coin["symbol"],
+            "seed": int(round(coin["seed"])),
+            "variation_range": int(round(coin["variation_range"])),
+        } for coin in data["coins"]]
+        market = cls(int(round(data["seed"])), starting_course=data["base_course"], coins=coins)
+        market.current_turn = int(round(data["current_turn"]))
+        
+        for name in ("current", "previous", "course_max", "course_min"):
+            values = data[name]
+            setattr(market, name, np.array(values, dtype=float) if np is not None
+                    else array('d', values))
+        
+        market.history = unpack_floats(data["history"])
+        return market
+
+
+# Example usage
+if __name__ == "__main__":
+    market = MultiMarket(seed=35042, coin_count=5)
+    
+    print("Turn | " + " | ".join(f"{symbol:>8}" for symbol in market.symbols))
+    print("-" * 60)
+    
+    for _ in range(10):
+        market.advance_turn()
+        courses = market.get_courses()
+        print(f"{market.current_turn:4d} | " +
+              " | ".join(f"{courses[symbol]:8.2f}" for symbol in market.symbols))
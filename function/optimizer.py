@@ -0,0 +1,245 @@
+"""
+Strategy Optimizer - Tune bot strategy parameters by batch simulation
+Evolutionary search over a seed set, with an evaluation cache
+"""
+
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from function.game_config import GameMode
+from function.simulator import TrendStrategy, game_seeds, play_game
+
+
+# Default search space of TrendStrategy
+TREND_SPACE = {
+    "pool_id": ["C53", "BTC", "FBG", "ITS"],
+    "window": [5, 20, 100],
+    "buy_below": (20, 150),
+    "sell_above": (50, 400),
+    "buy_fraction": (0.1, 1.0),
+    "card_budget": (6000, 200000),
+}
+
+
+def _evaluate(task):
+    """Worker: play one game of a strategy on one seed"""
+    strategy_class, params, seed, turns, game_mode = task
+    return play_game(strategy_class(**params), seed, turns, game_mode)
+
+
+class StrategyOptimizer:
+    """Search the parameters of a Strategy that maximize the mean score
+    
+    Each candidate is played on every seed of the seed set. Markets and
+    event streams only depend on the seed, so a (params, seed) result
+    never changes and is cached; a candidate seen again costs nothing.
+    """
+    
+    def __init__(self, strategy_class=TrendStrategy, space=None, seeds=None, turns=1000,
+                 game_mode=GameMode.UNLIMITED, workers=None, cache_path=None, random_seed=None):
+        """
+        Args:
+            strategy_class: Strategy subclass taking the parameters as keywords
+            space: {name: (low, high)} ranges or {name: [choices]}
+            seeds: Game seeds to evaluate on (10 seeds if None)
+            turns: Turns per game
+            game_mode: GameMode of the games
+            workers: Number of processes (all cores if None, 0 runs inline)
+            cache_path: Optional JSON file keeping the cache between runs
+            random_seed: Seed of the search itself
+        """
+        self.strategy_class = strategy_class
+        self.space = space or TREND_SPACE
+        self.seeds = list(seeds) if seeds is not None else game_seeds(0, 10)
+        self.turns = turns
+        self.game_mode = game_mode
+        self.workers = workers
+        self.cache_path = cache_path
+        self.rng = random.Random(random_seed)
+        
+        self.cache = {}
+        self.results = {}  # params key -> mean score
+        self.load_cache()
+    
+    # ------------------------------------------------------------------
+    # Cache
+    
+    @staticmethod
+    def params_key(params):
+        """Hashable, JSON-stable key of a parameter set"""
+        return json.dumps(params, sort_keys=True)
+    
+    def _cache_key(self, params, seed):
+        return (f"{self.strategy_class.__name__}|{self.game_mode.value}|{self.turns}|"
+                f"{self.params_key(params)}|{seed}")
+    
+    def load_cache(self):
+        """Load cached evaluations from cache_path"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            self.cache = {}
+    
+    def save_cache(self):
+        """Write cached evaluations to cache_path"""
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f)
+    
+    # ------------------------------------------------------------------
+    # Candidates
+    
+    def sample(self):
+        """Draw a random parameter set from the space"""
+        params = {}
+        for name, bounds in self.space.items():
+            if isinstance(bounds, list):
+                params[name] = self.rng.choice(bounds)
+            elif isinstance(bounds[0], int) and isinstance(bounds[1], int):
+                params[name] = self.rng.randint(bounds[0], bounds[1])
+            else:
+                params[name] = round(self.rng.uniform(bounds[0], bounds[1]), 3)
+        return params
+    
+    def mutate(self, params, scale=0.15):
+        """Copy of params with a few values moved around their current value"""
+        child = dict(params)
+        for name, bounds in self.space.items():
+            if self.rng.random() > 0.5:
+                continue
+            if isinstance(bounds, list):
+                child[name] = self.rng.choice(bounds)
+                continue
+            
+            low, high = bounds
+            value = child[name] + self.rng.gauss(0, (high - low) * scale)
+            value = min(high, max(low, value))
+            if isinstance(low, int) and isinstance(high, int):
+                child[name] = int(round(value))
+            else:
+                child[name] = round(value, 3)
+        return child
+    
+    # ------------------------------------------------------------------
+    # Evaluation
+    
+    def evaluate(self, candidates):
+        """
+        Mean score of each candidate over the seed set
+        
+        Only (params, seed) pairs missing from the cache are played,
+        in parallel.
+        
+        Returns:
+            List of (mean score, params), in candidate order
+        """
+        tasks = []
+        pending = set()
+        for params in candidates:
+            for seed in self.seeds:
+                key = self._cache_key(params, seed)
+                if key not in self.cache and key not in pending:
+                    pending.add(key)
+                    tasks.append((self.strategy_class, params, seed, self.turns, self.game_mode))
+        
+        if tasks:
+            if self.workers == 0:
+                results = map(_evaluate, tasks)
+                self._store(tasks, results)
+            else:
+                chunksize = max(1, len(tasks) // ((self.workers or os.cpu_count() or 1) * 4))
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    self._store(tasks, executor.map(_evaluate, tasks, chunksize=chunksize))
+        
+        scored = []
+        for params in candidates:
+            scores = [self.cache[self._cache_key(params, seed)]["score"] for seed in self.seeds]
+            mean = sum(scores) / len(scores)
+            self.results[self.params_key(params)] = mean
+            scored.append((mean, params))
+        return scored
+    
+    def _store(self, tasks, results):
+        for task, result in zip(tasks, results):
+            params, seed = task[1], task[2]
+            self.cache[self._cache_key(params, seed)] = {
+                "score": result["score"],
+                "max_dollar": result["max_dollar"],
+                "bankrupt_turn": result["bankrupt_turn"],
+            }
+    
+    def optimize(self, generations=5, population=16, elite=4, on_generation=None):
+        """
+        Evolutionary search: keep the best candidates, mutate them and
+        mix in fresh random ones
+        
+        Args:
+            generations: Number of generations
+            population: Candidates per generation
+            elite: Best candidates kept and mutated
+            on_generation: Optional callback(generation, best list)
+        
+        Returns:
+            Best strategies as a list of (mean score, params)
+        """
+        candidates = [self.sample() for _ in range(population)]
+        
+        for generation in range(generations):
+            self.evaluate(candidates)
+            best = self.get_best(elite)
+            if on_generation:
+                on_generation(generation, best)
+            
+            parents = [params for _, params in best]
+            candidates = list(parents)
+            while len(candidates) < population:
+                if parents and self.rng.random() < 0.75:
+                    candidates.append(self.mutate(self.rng.choice(parents)))
+                else:
+                    candidates.append(self.sample())
+        
+        self.save_cache()
+        return self.get_best(max(elite, 1))
+    
+    def get_best(self, count=5):
+        """Best evaluated strategies as (mean score, params)"""
+        ranked = sorted(self.results.items(), key=lambda item: item[1], reverse=True)
+        return [(score, json.loads(key)) for key, score in ranked[:count]]
+
+
+def main(argv=None):
+    """Command line optimizer for the trend strategy"""
+    parser = argparse.ArgumentParser(description="Tune bot strategy parameters")
+    parser.add_argument("--generations", type=int, default=5)
+    parser.add_argument("--population", type=int, default=16)
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", default=None, help="JSON file caching evaluations")
+    parser.add_argument("--random-seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    
+    optimizer = StrategyOptimizer(TrendStrategy, TREND_SPACE, game_seeds(0, args.seeds),
+                                  args.turns, workers=args.workers, cache_path=args.cache,
+                                  random_seed=args.random_seed)
+    
+    def show(generation, best):
+        print(f"Generation {generation + 1}: best mean score {best[0][0]:.1f}")
+    
+    best = optimizer.optimize(args.generations, args.population, on_generation=show)
+    
+    print("\nBest strategies:")
+    for score, params in best:
+        print(f"  {score:8.1f}  {params}")
+
+
+if __name__ == "__main__":
+    main()
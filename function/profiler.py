@@ -0,0 +1,162 @@
+"""
+Profiler - Opt-in wall time of each stage of a turn or frame
+In-memory histograms per stage, optionally logged as JSON lines
+"""
+
+import json
+import os
+import time
+
+# Environment variable enabling the game profiler: "1" keeps timings in
+# memory, any other value is also the JSON lines file to append to
+PROFILE_ENV = "TRADER_PROFILE"
+
+
+class StageTimer:
+    """Call count, total, min, max and a log2 histogram of one stage"""
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = []  # buckets[i]: durations in [2^(i-1), 2^i) microseconds
+    
+    def add(self, seconds):
+        """Count one timing"""
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        
+        index = int(seconds * 1e6).bit_length()
+        if index >= len(self.buckets):
+            self.buckets.extend([0] * (index + 1 - len(self.buckets)))
+        self.buckets[index] += 1
+    
+    def percentile(self, p):
+        """Approximate percentile in seconds (upper edge of its bucket)"""
+        if self.count == 0:
+            return 0.0
+        target = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return min(self.max, (1 << index) / 1e6)
+        return self.max
+    
+    def to_dict(self):
+        """Convert to dictionary (microseconds)"""
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1e3,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "min_us": (self.min or 0.0) * 1e6,
+            "p50_us": self.percentile(50) * 1e6,
+            "p95_us": self.percentile(95) * 1e6,
+            "max_us": self.max * 1e6,
+        }
+
+
+class StageProfiler:
+    """Times consecutive stages of a turn or a main loop frame
+    
+    start() opens a record, each mark(stage) charges the time since the
+    previous mark to `stage`, and end() closes the record (written as one
+    JSON line when a path is given). Code under profile keeps a reference
+    that is None when profiling is off, so the cost is a single check.
+    """
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.stages = {}
+        self._file = None
+        self._record = None
+        self._last = None
+    
+    def start(self, kind="turn", **fields):
+        """Open a record (turn, frame, ...)"""
+        self._record = {"kind": kind}
+        self._record.update(fields)
+        self._record["stages"] = {}
+        self._last = time.perf_counter()
+    
+    def mark(self, stage):
+        """Charge the time since the previous mark to `stage`"""
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        
+        timer = self.stages.get(stage)
+        if timer is None:
+            timer = self.stages[stage] = StageTimer()
+        timer.add(elapsed)
+        
+        if self._record is not None:
+            stages = self._record["stages"]
+            stages[stage] = stages.get(stage, 0.0) + elapsed * 1e6
+    
+    def end(self):
+        """Close the record and log it"""
+        if self._record is None:
+            return
+        if self.path:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._record["time"] = time.time()
+            self._file.write(json.dumps(self._record) + "\n")
+            self._file.flush()
+        self._record = None
+    
+    def get_report(self):
+        """Statistics of every stage, in first-seen order"""
+        return {stage: timer.to_dict() for stage, timer in self.stages.items()}
+    
+    def reset(self):
+        """Forget the collected timings"""
+        self.stages = {}
+    
+    def close(self):
+        """Close the JSON lines file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def display(self):
+        """Print the stage table"""
+        print("\n" + "="*72)
+        print("PERFORMANCE".center(72))
+        print("="*72)
+        print(f"{'Stage':<16}{'Calls':>8}{'Total ms':>11}{'Mean us':>10}"
+              f"{'p50 us':>9}{'p95 us':>9}{'Max us':>9}")
+        for stage, stats in self.get_report().items():
+            print(f"{stage:<16}{stats['count']:>8}{stats['total_ms']:>11.2f}"
+                  f"{stats['mean_us']:>10.1f}{stats['p50_us']:>9.0f}"
+                  f"{stats['p95_us']:>9.0f}{stats['max_us']:>9.0f}")
+        print("="*72)
+
+
+def from_environment():
+    """Get a StageProfiler if TRADER_PROFILE is set, else None"""
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if not value or value == "0":
+        return None
+    return StageProfiler(None if value == "1" else value)
+
+
+# Example usage
+if __name__ == "__main__":
+    profiler = StageProfiler()
+    
+    for turn in range(100):
+        profiler.start("turn", turn=turn)
+        sum(range(1000))
+        profiler.mark("market")
+        sum(range(10000))
+        profiler.mark("mining")
+        profiler.end()
+    
+    profiler.display()
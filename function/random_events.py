@@ -14,10 +14,10 @@ class RandomEvent:
         self.min_cost_percent = min_cost_percent
         self.max_cost_percent = max_cost_percent
     
-    def calculate_cost(self, player_dollar):
+    def calculate_cost(self, player_dollar, rng=random):
         """Calculate event cost based on player's wealth"""
-        base_cost = random.randint(10, 20)
-        percent_cost = random.randint(
+        base_cost = rng.randint(10, 20)
+        percent_cost = rng.randint(
             int(player_dollar * self.min_cost_percent),
             int(player_dollar * self.max_cost_percent)
         )
@@ -31,7 +31,8 @@ class RandomEvent:
 class EventManager:
     """Manages random events that cost the player money"""
     
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng or random
         self.events = [
             RandomEvent(1, "You didn't declare your pool!", 0.005, 0.1),
             RandomEvent(2, "It's just another day", 0.005, 0.1),
@@ -67,7 +68,7 @@ class EventManager:
             return False
         
         # Base chance from malus level
-        roll = random.randint(0, 9)
+        roll = self.rng.randint(0, 9)
         
         if pool_reduces_malus:
             # ITS/ITS+ pools reduce malus chance
@@ -81,8 +82,8 @@ class EventManager:
             return None
         
         # Select random event
-        event = random.choice(self.events)
-        cost = event.calculate_cost(player_dollar)
+        event = self.rng.choice(self.events)
+        cost = event.calculate_cost(player_dollar, self.rng)
         
         # Ensure cost doesn't exceed player's money
         cost = min(cost, int(player_dollar * 0.5))  # Max 50% of wealth
@@ -118,6 +119,21 @@ class PepeEvent:
     @staticmethod
     def trigger_pepe(current_course=None):
         """Trigger Pepe quiz event"""
+        if not PepeEvent.ask_ready():
+            return {"success": False, "multiplier": 1.0}
+        
+        question_data = PepeEvent.pick_question(current_course)
+        
+        print(f"\nQuestion: {question_data['question']}")
+        
+        result = PepeEvent.check_answer(question_data, input("Your answer: "))
+        PepeEvent.display_result(result)
+        
+        return {"success": result["success"], "multiplier": result["multiplier"]}
+    
+    @staticmethod
+    def ask_ready():
+        """Show Pepe and ask the player to play (True if accepted)"""
         print("\n" + "="*60)
         print("🐸 PEPE THE FROG APPEARS!".center(60))
         print("="*60)
@@ -128,44 +144,61 @@ class PepeEvent:
         
         if response != "yes":
             print("\nPepe: Okay, see you next time!")
-            return {"success": False, "multiplier": 1.0}
+            return False
         
         print("\nPepe: Let's see if you deserve your money!")
-        
-        # Select random question
-        question_data = random.choice(PepeEvent.QUESTIONS)
+        return True
+    
+    @staticmethod
+    def display_result(result):
+        """Display the outcome of a quiz answer"""
+        if result["valid"] is False:
+            print("\nPepe: Do you even speak our language?")
+        elif result["success"]:
+            print("\n✓ Correct!")
+            print("Pepe: You deserve your money!")
+            print("Pepe: I will multiply it by 1.5!")
+        else:
+            print("\n✗ Wrong!")
+            print("Pepe: Too bad, I'll have to divide your money by 2")
+            print("Pepe: Maybe next time you'll be more worthy.")
+    
+    @staticmethod
+    def pick_question(current_course=None, rng=random):
+        """Select the quiz question"""
+        question_data = rng.choice(PepeEvent.QUESTIONS)
         
         # If asking about course, use current course
-        if current_course and random.randint(1, 3) == 1:
+        if current_course and rng.randint(1, 3) == 1:
             question_data = {
                 "question": "What was the last @ course value?",
                 "answer": int(current_course)
             }
         
-        print(f"\nQuestion: {question_data['question']}")
+        return question_data
+    
+    @staticmethod
+    def check_answer(question_data, answer):
+        """
+        Check an answer to a quiz question
         
+        Returns:
+            Dictionary with success, multiplier and valid (False when the
+            answer is not a number)
+        """
         try:
-            answer = float(input("Your answer: "))
-            
-            if answer == question_data['answer']:
-                print("\n✓ Correct!")
-                print("Pepe: You deserve your money!")
-                print("Pepe: I will multiply it by 1.5!")
-                return {"success": True, "multiplier": 1.5}
-            else:
-                print("\n✗ Wrong!")
-                print("Pepe: Too bad, I'll have to divide your money by 2")
-                print("Pepe: Maybe next time you'll be more worthy.")
-                return {"success": False, "multiplier": 0.5}
-                
-        except ValueError:
-            print("\nPepe: Do you even speak our language?")
-            return {"success": False, "multiplier": 1.0}
+            answer = float(answer)
+        except (TypeError, ValueError):
+            return {"success": False, "multiplier": 1.0, "valid": False}
+        
+        if answer == question_data['answer']:
+            return {"success": True, "multiplier": 1.5, "valid": True}
+        return {"success": False, "multiplier": 0.5, "valid": True}
     
     @staticmethod
-    def should_appear():
+    def should_appear(rng=random):
         """Check if Pepe should appear (1/20 chance)"""
-        return random.randint(1, 20) == 1
+        return rng.randint(1, 20) == 1
 
 
 class AchievementChecker:
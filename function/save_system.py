@@ -1,12 +1,50 @@
 """
 Save System - Handles game saving/loading with optional encoding
+Full saves, or snapshots plus an append-only action journal
+JSON ("2.0") or binary ("3.0") save files, detected on load
 """
 
+import base64
+import copy
 import json
 import os
 import random
+import shutil
+import struct
+import sys
+import threading
+import zlib
+from array import array
 from datetime import datetime
 
+# Save modes: "full" rewrites the whole game at each save, "journal"
+# appends the actions since the last save and rewrites it only sometimes
+SAVE_MODES = ("full", "journal")
+SAVE_MODE_ENV = "TRADER_SAVE_MODE"
+
+# Save file formats and their file names
+SAVE_FORMATS = {"json": "game_save.json", "binary": "game_save.bin"}
+SAVE_FORMAT_ENV = "TRADER_SAVE_FORMAT"
+
+
+def _write_synced(path, raw):
+    """Write a file and wait until it is on disk"""
+    with open(path, 'wb') as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _sync_directory(path):
+    """Make the renames in a directory durable (POSIX only)"""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
 
 class SaveEncoder:
     """Encode/decode save data for basic protection"""
@@ -39,18 +77,587 @@ class SaveEncoder:
         return random.randint(50000, 1000000)
 
 
+class BinarySave:
+    """Binary save file: header, packed fixed fields, JSON rest, raw history
+    
+    Layout (little-endian):
+        header   magic, version, flags, key, saved_at, journal_seq
+        fixed    presence bitmask + the numbers of SCHEMAS[version]
+        rest     length-prefixed compact JSON of every other value
+        history  kind, start_turn, length, segment_turns, then the raw
+                 doubles when the history is stored inline (other keys of
+                 a segment reference, like its run, stay in the rest)
+    
+    A field is packed only if its value fits its type, anything else
+    stays in the JSON rest, so any game dictionary round-trips. Encoded
+    saves XOR the fixed and rest sections with a stream seeded by key.
+    A new schema gets a new version; old versions stay readable.
+    """
+    
+    MAGIC = b"TGLS"
+    VERSION = 3
+    HEADER = struct.Struct("<4sHHI32sq")
+    REST = struct.Struct("<I")
+    HISTORY = struct.Struct("<BqQI")
+    
+    ENCODED = 1
+    HISTORY_NONE, HISTORY_INLINE, HISTORY_SEGMENTS = 0, 1, 2
+    
+    # (section, field, struct code) per version: q int, d float, ? bool
+    SCHEMAS = {
+        3: (
+            ("session", "seed", "q"),
+            ("session", "sync_seed", "q"),
+            ("session", "created_at", "d"),
+            ("session", "last_update", "d"),
+            ("session", "turn_count", "q"),
+            ("market", "seed", "q"),
+            ("market", "current_turn", "q"),
+            ("market", "base_course", "d"),
+            ("market", "current_course", "d"),
+            ("market", "previous_course", "d"),
+            ("market", "course_max", "d"),
+            ("market", "course_min", "d"),
+            ("wallet", "dollar", "d"),
+            ("wallet", "arobase", "d"),
+            ("wallet", "arobase_for_sale", "d"),
+            ("wallet", "max_dollar", "d"),
+            ("wallet", "min_dollar", "d"),
+            ("wallet", "max_arobase", "d"),
+            ("wallet", "min_arobase", "d"),
+            ("wallet", "victory_purchased", "?"),
+            ("mining", "cooldown_remaining", "q"),
+            ("mining", "its_plus_unlocked", "?"),
+        )
+    }
+    
+    _structs = {}
+    
+    @classmethod
+    def _fixed(cls, version):
+        """Struct of the fixed section of a schema version"""
+        fixed = cls._structs.get(version)
+        if fixed is None:
+            codes = "".join(code for _, _, code in cls.SCHEMAS[version])
+            fixed = cls._structs[version] = struct.Struct("<Q" + codes)
+        return fixed
+    
+    @staticmethod
+    def _fits(value, code):
+        if code == "?":
+            return isinstance(value, bool)
+        if isinstance(value, bool):
+            return False
+        if code == "q":
+            return isinstance(value, int) or (isinstance(value, float) and value.is_integer()
+                                              and abs(value) < 2 ** 63)
+        return isinstance(value, (int, float))
+    
+    @staticmethod
+    def _mask(data, key):
+        """XOR data with the byte stream of key (its own inverse)"""
+        if not data:
+            return data
+        # Whole 32-bit words so that a prefix gets the same mask
+        size = (len(data) + 3) // 4 * 4
+        stream = random.Random(key).getrandbits(size * 8).to_bytes(size, "little")
+        masked = int.from_bytes(data, "little") ^ int.from_bytes(stream[:len(data)], "little")
+        return masked.to_bytes(len(data), "little")
+    
+    @classmethod
+    def dumps(cls, game_data, saved_at, encode=True, journal_seq=None):
+        """Build the bytes of a save file"""
+        schema = cls.SCHEMAS[cls.VERSION]
+        rest = {name: dict(value) if isinstance(value, dict) else value
+                for name, value in game_data.items()}
+        
+        # History: raw doubles or a segment reference, out of the JSON
+        history_kind, start_turn, length, segment_turns = cls.HISTORY_NONE, 0, 0, 0
+        buffer = b""
+        market = rest.get("market")
+        history = market.get("history") if isinstance(market, dict) else None
+        if isinstance(history, dict) and "length" in history:
+            history_kind = cls.HISTORY_SEGMENTS
+            start_turn = int(history["start_turn"])
+            length = int(history["length"])
+            segment_turns = int(history["segment_turns"])
+            del market["history"]
+            extra = {k: v for k, v in history.items()
+                     if k not in ("start_turn", "length", "segment_turns")}
+            if extra:
+                market["history"] = extra
+        elif isinstance(history, dict) and isinstance(history.get("values"), (str, array)):
+            values = history["values"]
+            if isinstance(values, str):
+                buffer = base64.b64decode(values)  # Already little-endian
+            else:
+                values = array('d', values)
+                if sys.byteorder == "big":
+                    values.byteswap()
+                buffer = values.tobytes()
+            history_kind = cls.HISTORY_INLINE
+            start_turn = int(history.get("start_turn", 0))
+            length = len(buffer) // 8
+            del market["history"]
+            market.pop("candles", None)  # Rebuilt from the history on load
+        
+        # Fixed fields
+        present = 0
+        numbers = []
+        for index, (section, name, code) in enumerate(schema):
+            values = rest.get(section)
+            if isinstance(values, dict) and name in values and cls._fits(values[name], code):
+                value = values.pop(name)
+                present |= 1 << index
+                numbers.append(int(value) if code == "q" else value)
+            else:
+                numbers.append(0)
+        fixed = cls._fixed(cls.VERSION).pack(present, *numbers)
+        text = json.dumps(rest, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        body = fixed + cls.REST.pack(len(text)) + text
+        
+        key = 0
+        flags = 0
+        if encode:
+            key = SaveEncoder.generate_key()
+            flags |= cls.ENCODED
+            body = cls._mask(body, key)
+        
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, flags, key,
+                                 saved_at.encode("ascii")[:32],
+                                 -1 if journal_seq is None else journal_seq)
+        history_header = cls.HISTORY.pack(history_kind, start_turn, length, segment_turns)
+        return b"".join((header, body, history_header, buffer))
+    
+    @classmethod
+    def read_header(cls, raw):
+        """Save dictionary of the header (like a JSON save without its data)"""
+        if len(raw) < cls.HEADER.size or raw[:4] != cls.MAGIC:
+            raise ValueError("Not a binary save")
+        magic, version, flags, key, saved_at, journal_seq = cls.HEADER.unpack_from(raw)
+        header = {
+            "version": f"{version}.0",
+            "format": "binary",
+            "saved_at": saved_at.rstrip(b"\0").decode("ascii"),
+            "encoded": bool(flags & cls.ENCODED),
+            "key": key,
+        }
+        if journal_seq >= 0:
+            header["journal_seq"] = journal_seq
+        return header, version
+    
+    @classmethod
+    def loads(cls, raw):
+        """
+        Parse the bytes of a save file
+        
+        Returns:
+            (game data, save dictionary of the header)
+        """
+        header, version = cls.read_header(raw)
+        if version not in cls.SCHEMAS:
+            raise ValueError(f"Unsupported binary save version: {version}")
+        schema = cls.SCHEMAS[version]
+        fixed = cls._fixed(version)
+        
+        # Unmask the fixed section and the rest (its length is masked too)
+        offset = cls.HEADER.size
+        head = raw[offset:offset + fixed.size + cls.REST.size]
+        if header["encoded"]:
+            head = cls._mask(head, header["key"])
+        (rest_length,) = cls.REST.unpack_from(head, fixed.size)
+        body = raw[offset:offset + fixed.size + cls.REST.size + rest_length]
+        if header["encoded"]:
+            body = cls._mask(body, header["key"])
+        if len(body) != fixed.size + cls.REST.size + rest_length:
+            raise ValueError("Truncated binary save")
+        offset += len(body)
+        
+        data = json.loads(body[fixed.size + cls.REST.size:].decode("utf-8"))
+        numbers = fixed.unpack_from(body)
+        present = numbers[0]
+        for index, (section, name, code) in enumerate(schema):
+            if present & (1 << index):
+                data.setdefault(section, {})[name] = numbers[index + 1]
+        
+        history_kind, start_turn, length, segment_turns = cls.HISTORY.unpack_from(raw, offset)
+        offset += cls.HISTORY.size
+        if history_kind == cls.HISTORY_SEGMENTS:
+            data["market"]["history"] = dict(data["market"].get("history", {}),
+                                             start_turn=start_turn, length=length,
+                                             segment_turns=segment_turns)
+        elif history_kind == cls.HISTORY_INLINE:
+            values = array('d')
+            values.frombytes(raw[offset:offset + length * 8])
+            if len(values) != length:
+                raise ValueError("Truncated binary save")
+            if sys.byteorder == "big":
+                values.byteswap()
+            data["market"]["history"] = {"start_turn": start_turn, "values": values}
+        
+        return data, header
+
+
+class ActionJournal:
+    """Append-only log of the actions applied to a game
+    
+    Each entry is one JSON line {"seq", "turn", "action"}: seq numbers
+    keep growing across snapshots, turn is the turn reached after the
+    action (checked on replay). Entries are kept in memory until flush(),
+    so a save only writes the actions since the previous one.
+    """
+    
+    FILE_NAME = "journal.jsonl"
+    
+    def __init__(self, path, seq=0):
+        self.path = path
+        self.seq = seq
+        self.snapshot_seq = seq
+        self.pending = []
+    
+    def record(self, action, turn):
+        """Add an applied action"""
+        self.seq += 1
+        self.pending.append({"seq": self.seq, "turn": turn, "action": action})
+    
+    def since_snapshot(self):
+        """Number of actions not in the last snapshot"""
+        return self.seq - self.snapshot_seq
+    
+    def take(self):
+        """Remove and return the pending entries (to write() them later)"""
+        entries, self.pending = self.pending, []
+        return entries
+    
+    def write(self, entries):
+        """Append entries to the file"""
+        if not entries:
+            return 0
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return len(entries)
+    
+    def flush(self):
+        """Append the pending entries to the file"""
+        return self.write(self.take())
+    
+    def truncate(self, seq=None):
+        """Empty the file once a snapshot holds its entries (up to seq)"""
+        if seq is None:
+            self.flush()
+            seq = self.seq
+        with open(self.path, 'w', encoding='utf-8'):
+            pass
+        self.snapshot_seq = max(self.snapshot_seq, seq)
+    
+    @staticmethod
+    def read(path, after_seq=0):
+        """
+        Read the entries of a journal file
+        
+        Args:
+            path: Journal file
+            after_seq: Skip entries already in the snapshot
+        
+        Returns:
+            List of entries in order (an unreadable line, or one without
+            an integer seq, ends the list)
+        """
+        entries = []
+        if not os.path.exists(path):
+            return entries
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    seq = entry["seq"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    break  # Line cut by a crash
+                if not isinstance(seq, int) or isinstance(seq, bool):
+                    break
+                if seq > after_seq:
+                    entries.append(entry)
+        return entries
+
+
+class HistorySegments:
+    """Market history of a save as append-only files of raw courses
+    
+    Each history (a start turn and its courses) is written in a run
+    directory of its own: segment i holds turns start_turn + i *
+    segment_turns onwards as little-endian doubles. A save only appends
+    what was added since the previous one, synced before the save file is
+    committed, so its cost does not grow with the length of the game.
+    Bytes on disk are never rewritten: another history, or bytes past the
+    saved length (from an interrupted save), start a new run, and the
+    older save generations keep the segments they reference.
+    
+    The courses are not encoded (each save has its own key, segments are
+    shared by saves): the save records the CRC-32 of the bytes it uses,
+    so segments changed outside the game make the save unreadable.
+    """
+    
+    DIRECTORY = "history"
+    SEGMENT_TURNS = 4096
+    
+    def __init__(self, directory, segment_turns=SEGMENT_TURNS, run=None):
+        self.directory = directory
+        self.segment_turns = segment_turns
+        self.run = run  # None: segments directly in directory (older saves)
+        self.start_turn = None
+        self.saved = 0  # Courses already on disk
+        self.crc32 = 0  # CRC-32 of their bytes
+        self.new_run = False  # A run was started since the last prune
+    
+    @staticmethod
+    def run_of(reference):
+        """Run of a segment reference (encoded saves decode it as a float)"""
+        run = reference.get("run")
+        return None if run is None else int(round(run))
+    
+    def _run_directory(self, run):
+        if run is None:
+            return self.directory
+        return os.path.join(self.directory, f"run_{run:06d}")
+    
+    def _path(self, index):
+        return os.path.join(self._run_directory(self.run), f"segment_{index:06d}.bin")
+    
+    def runs(self):
+        """Numbers of the run directories on disk"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(item[4:]) for item in os.listdir(self.directory)
+                      if item.startswith("run_") and item[4:].isdigit())
+    
+    def _appendable(self):
+        """True if the run holds exactly the saved courses"""
+        index = self.saved // self.segment_turns
+        path = self._path(index)
+        on_disk = os.path.getsize(path) // 8 if os.path.exists(path) else 0
+        return (on_disk == self.saved - index * self.segment_turns
+                and not os.path.exists(self._path(index + 1)))
+    
+    def _start_run(self):
+        """Write the next history in a new run directory"""
+        self.run = max(self.runs(), default=0) + 1
+        os.makedirs(self._run_directory(self.run))
+        _sync_directory(self.directory)
+        _sync_directory(os.path.dirname(self.directory))
+        self.saved = 0
+        self.crc32 = 0
+        self.new_run = True
+    
+    def write(self, start_turn, values, length=None):
+        """
+        Append the courses not saved yet, synced to disk
+        
+        Args:
+            start_turn: Turn of values[0]
+            values: Every course of the history
+            length: Number of values to save (all if None)
+        
+        Returns:
+            Number of segment files written
+        """
+        if length is None:
+            length = len(values)
+        if start_turn != self.start_turn or length < self.saved or not self._appendable():
+            self.start_turn = start_turn  # Another history: write it all
+            self._start_run()
+        
+        size = self.segment_turns
+        written = 0
+        created = False
+        index = self.saved // size
+        while index * size < length:
+            path = self._path(index)
+            created = created or not os.path.exists(path)
+            chunk = array('d', values[max(self.saved, index * size):min(length, (index + 1) * size)])
+            if sys.byteorder == "big":
+                chunk.byteswap()
+            
+            data = chunk.tobytes()
+            self.crc32 = zlib.crc32(data, self.crc32)
+            with open(path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            written += 1
+            index += 1
+        if created:
+            _sync_directory(self._run_directory(self.run))
+        
+        self.saved = length
+        return written
+    
+    def remove_runs(self, keep):
+        """Delete the runs (None: segments of older saves) not in keep"""
+        for run in self.runs():
+            if run not in keep:
+                shutil.rmtree(self._run_directory(run))
+        if None not in keep and os.path.isdir(self.directory):
+            for item in os.listdir(self.directory):
+                if item.startswith("segment_"):
+                    os.remove(os.path.join(self.directory, item))
+    
+    def read(self, start_turn, length, crc32=None):
+        """
+        Read `length` courses
+        
+        Args:
+            crc32: CRC-32 recorded by the save (not checked if None)
+        
+        Raises:
+            ValueError: If a segment is missing, too short or changed
+        """
+        values = array('d')
+        crc = 0
+        size = self.segment_turns
+        for index in range((length + size - 1) // size):
+            count = min(size, length - index * size)
+            try:
+                with open(self._path(index), 'rb') as f:
+                    data = f.read(count * values.itemsize)
+            except OSError:
+                data = b""
+            if len(data) != count * values.itemsize:
+                raise ValueError(f"Market history segment {index} is incomplete")
+            crc = zlib.crc32(data, crc)
+            values.frombytes(data)
+        if crc32 is not None and crc != crc32:
+            raise ValueError("Market history segments do not match the save")
+        
+        if sys.byteorder == "big":
+            values.byteswap()
+        self.start_turn = start_turn
+        self.saved = length
+        self.crc32 = crc
+        return values
+
+
+class _SavedHistory:
+    """History given to save_game: its first `length` values
+    
+    The game only appends to its history, so a view of the current
+    length stays valid while the game goes on (background saves).
+    """
+    
+    def __init__(self, start_turn, values, length=None):
+        self.start_turn = start_turn
+        self._values = values
+        self.length = len(values) if length is None else length
+    
+    def __len__(self):
+        return self.length
+    
+    def values(self):
+        return self._values
+
+
+class SaveCatalog:
+    """Index of the saves of a directory, so listing them reads one file
+    
+    catalog.json maps each game name to the header of its save file
+    (saved_at, version, format), the size and modification time of that
+    file and the mode, turn and score of the game. SaveManager updates it
+    on every save and delete; an entry whose save file changed behind its
+    back, or a catalog that cannot be read, is rebuilt from the saves.
+    """
+    
+    FILE_NAME = "catalog.json"
+    VERSION = 1
+    
+    def __init__(self, directory):
+        self.path = os.path.join(directory, self.FILE_NAME)
+        self._lock = threading.Lock()  # Auto-saves update it from their worker
+    
+    def read(self):
+        """Entries by game name ({} if missing or unreadable)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                catalog = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(catalog, dict) or catalog.get("version") != self.VERSION:
+            return {}
+        return catalog.get("saves", {})
+    
+    def write(self, entries):
+        """Replace every entry"""
+        with self._lock:
+            self._write(entries)
+    
+    def _write(self, entries):
+        # Rebuilt if lost, so a rename is enough (no fsync)
+        with open(self.path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({"version": self.VERSION, "saves": entries}, f,
+                      ensure_ascii=False, separators=(",", ":"))
+        os.replace(self.path + ".tmp", self.path)
+    
+    def update(self, game_name, **fields):
+        """Set fields of a game entry (the others are kept)"""
+        with self._lock:
+            entries = self.read()
+            entries.setdefault(game_name, {}).update(fields)
+            self._write(entries)
+    
+    def remove(self, game_name):
+        """Forget a game"""
+        with self._lock:
+            entries = self.read()
+            if entries.pop(game_name, None) is not None:
+                self._write(entries)
+
+
 class SaveManager:
-    """Manages game save and load operations"""
+    """Manages game save and load operations
+    
+    Save files are replaced atomically (see _commit): a crash during a
+    save leaves the previous save readable, and the last keep_generations
+    saves stay next to it as game_save.json.<n> (or .bin.<n>).
+    """
     
-    def __init__(self, save_directory="Game_data/Parties"):
+    WAL_FILE = "save.wal"
+    TMP_SUFFIX = ".tmp"
+    
+    def __init__(self, save_directory="Game_data/Parties", save_mode=None,
+                 snapshot_interval=500, save_format=None, catalog_info=None,
+                 keep_generations=3):
+        """
+        Args:
+            save_directory: Directory holding one folder per game
+            save_mode: "full" or "journal" (TRADER_SAVE_MODE or "full" if None)
+            snapshot_interval: Journal mode: actions between two snapshots
+            save_format: "json" or "binary" file written by saves
+                         (TRADER_SAVE_FORMAT or "json" if None); loads
+                         read both
+            catalog_info: Optional function game data -> {"mode", "turn",
+                          "score"} filling the catalog (list_saves)
+            keep_generations: Number of previous save files kept per game
+        """
         self.save_directory = save_directory
+        self.save_mode = save_mode or os.environ.get(SAVE_MODE_ENV, "full")
+        if self.save_mode not in SAVE_MODES:
+            raise ValueError(f"Unknown save mode: {self.save_mode}")
+        self.save_format = save_format or os.environ.get(SAVE_FORMAT_ENV, "json")
+        if self.save_format not in SAVE_FORMATS:
+            raise ValueError(f"Unknown save format: {self.save_format}")
+        self.snapshot_interval = snapshot_interval
+        self.catalog_info = catalog_info
+        self.keep_generations = keep_generations
+        self._segments = {}  # game name -> HistorySegments
         self.ensure_directory_exists()
+        self.catalog = SaveCatalog(save_directory)
     
     def ensure_directory_exists(self):
         """Create save directory if it doesn't exist"""
         os.makedirs(self.save_directory, exist_ok=True)
     
-    def save_game(self, game_name, game_data, encode=True):
+    def save_game(self, game_name, game_data, encode=True, journal_seq=None, history=None,
+                  save_format=None, info=None):
         """
         Save game data to file
         
@@ -58,19 +665,42 @@ class SaveManager:
             game_name: Name of the save file
             game_data: Dictionary containing all game data
             encode: Whether to encode numeric values
+            journal_seq: Last journal entry included (snapshots only)
+            history: Optional CourseHistory saved in segment files, for
+                     game_data built with GameEngine.to_dict(history=False)
+            save_format: "json" or "binary" (self.save_format if None)
+            info: Catalog fields {"mode", "turn", "score"} of the game
+                  (computed with catalog_info if None)
         """
         save_path = os.path.join(self.save_directory, game_name)
         os.makedirs(save_path, exist_ok=True)
         
-        file_path = os.path.join(save_path, "game_save.json")
+        save_format = save_format or self.save_format
+        file_path = os.path.join(save_path, SAVE_FORMATS[save_format])
+        saved_at = datetime.now().isoformat()
+        
+        if info is None and self.catalog_info is not None:
+            info = self.catalog_info(game_data)
+        
+        if history is not None:
+            game_data = self._save_history(game_name, game_data, history)
+        
+        if save_format == "binary":
+            raw = BinarySave.dumps(game_data, saved_at, encode, journal_seq)
+            self._commit(save_path, SAVE_FORMATS[save_format], raw)
+            self._prune_history(game_name)
+            self._update_catalog(game_name, file_path, saved_at, f"{BinarySave.VERSION}.0", info)
+            return True
         
         # Prepare save data
         save_dict = {
             "version": "2.0",
-            "saved_at": datetime.now().isoformat(),
+            "saved_at": saved_at,
             "encoded": encode,
             "data": {}
         }
+        if journal_seq is not None:
+            save_dict["journal_seq"] = journal_seq
         
         if encode:
             # Generate encoding key
@@ -84,11 +714,163 @@ class SaveManager:
             save_dict["data"] = game_data
         
         # Write to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(save_dict, f, indent=4, ensure_ascii=False)
-        
+        raw = json.dumps(save_dict, indent=4, ensure_ascii=False).encode('utf-8')
+        self._commit(save_path, SAVE_FORMATS[save_format], raw)
+        self._prune_history(game_name)
+        self._update_catalog(game_name, file_path, saved_at, save_dict["version"], info)
         return True
     
+    def _update_catalog(self, game_name, file_path, saved_at, version, info=None):
+        """Record a save file just written in the catalog"""
+        stat = os.stat(file_path)
+        self.catalog.update(game_name, saved_at=saved_at, version=version,
+                            file=os.path.basename(file_path), size=stat.st_size,
+                            mtime=stat.st_mtime_ns, **(info or {}))
+    
+    def _commit(self, save_path, file_name, raw):
+        """
+        Replace a save file with raw, crash-safe
+        
+        1. write-ahead record: file name, size and CRC of the new content
+        2. new content in game_save.*.tmp, synced to disk
+        3. current save file kept as the next generation (hard link)
+        4. rename of the temporary file over the save file
+        5. removal of the record
+        
+        A crash before step 4 leaves the previous save in place, a crash
+        after it the new one; recover() finishes or undoes the save.
+        """
+        record = {"file": file_name, "size": len(raw), "crc32": zlib.crc32(raw)}
+        # Not synced: without the record, recover() drops the temporary file
+        with open(os.path.join(save_path, self.WAL_FILE), 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        _write_synced(os.path.join(save_path, file_name + self.TMP_SUFFIX), raw)
+        self._finish_commit(save_path, file_name)
+    
+    def _finish_commit(self, save_path, file_name):
+        """Steps 3 to 5 of _commit (the temporary file is complete)"""
+        file_path = os.path.join(save_path, file_name)
+        tmp_path = file_path + self.TMP_SUFFIX
+        if os.path.exists(tmp_path):
+            for current in SAVE_FORMATS.values():
+                if os.path.exists(os.path.join(save_path, current)):
+                    self._keep_generation(save_path, current)
+            os.replace(tmp_path, file_path)
+            _sync_directory(save_path)
+        
+        self._remove_other_formats(save_path, file_name)
+        self._prune_generations(save_path)
+        os.remove(os.path.join(save_path, self.WAL_FILE))
+    
+    @staticmethod
+    def _generations(save_path):
+        """Previous save files of a game as (number, path), oldest first"""
+        generations = []
+        for item in os.listdir(save_path):
+            name, _, number = item.rpartition(".")
+            if name in SAVE_FORMATS.values() and number.isdigit():
+                generations.append((int(number), os.path.join(save_path, item)))
+        generations.sort()
+        return generations
+    
+    def _keep_generation(self, save_path, file_name):
+        """Keep the current save file as the newest generation"""
+        file_path = os.path.join(save_path, file_name)
+        generations = self._generations(save_path)
+        if generations and os.path.samefile(generations[-1][1], file_path):
+            return  # Already kept by an interrupted save
+        number = generations[-1][0] + 1 if generations else 1
+        try:
+            os.link(file_path, f"{file_path}.{number}")  # No copy
+        except OSError:
+            shutil.copyfile(file_path, f"{file_path}.{number}")  # No hard links here
+    
+    def _prune_generations(self, save_path):
+        """Delete the generations beyond keep_generations"""
+        generations = self._generations(save_path)
+        for _, path in generations[:max(0, len(generations) - self.keep_generations)]:
+            os.remove(path)
+    
+    @staticmethod
+    def _remove_other_formats(save_path, file_name):
+        """Delete the save file of the other formats (now outdated)"""
+        for other in SAVE_FORMATS.values():
+            if other != file_name:
+                other_path = os.path.join(save_path, other)
+                if os.path.exists(other_path):
+                    os.remove(other_path)
+    
+    def recover(self, game_name):
+        """
+        Repair a game after a crash: finish or undo an interrupted save,
+        then restore the newest valid generation if the save is unreadable
+        
+        Returns:
+            True if something was repaired
+        """
+        save_path = os.path.join(self.save_directory, game_name)
+        wal_path = os.path.join(save_path, self.WAL_FILE)
+        repaired = False
+        
+        if os.path.exists(wal_path):
+            try:
+                with open(wal_path, 'rb') as f:
+                    record = json.loads(f.read().decode('utf-8'))
+                file_name = record["file"]
+                with open(os.path.join(save_path, file_name + self.TMP_SUFFIX), 'rb') as f:
+                    raw = f.read()
+                complete = (file_name in SAVE_FORMATS.values() and len(raw) == record["size"]
+                            and zlib.crc32(raw) == record["crc32"])
+            except (OSError, ValueError, KeyError, TypeError):
+                complete = False
+            
+            if complete:
+                self._finish_commit(save_path, file_name)  # Roll forward
+            else:
+                os.remove(wal_path)  # Roll back: the save file was not touched
+            repaired = True
+        
+        for file_name in SAVE_FORMATS.values():
+            tmp_path = os.path.join(save_path, file_name + self.TMP_SUFFIX)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+                repaired = True
+        
+        current = self._save_file(game_name)
+        if current is not None and not repaired:
+            return False
+        if current is not None and self._read_save_file(game_name, current)[0] is not None:
+            return repaired
+        
+        # Restore the newest readable generation as the save file
+        for _, path in reversed(self._generations(save_path)):
+            if self._read_save_file(game_name, path)[0] is not None:
+                file_name = os.path.basename(path).rpartition(".")[0]
+                with open(path, 'rb') as f:
+                    _write_synced(os.path.join(save_path, file_name + self.TMP_SUFFIX), f.read())
+                os.replace(os.path.join(save_path, file_name + self.TMP_SUFFIX),
+                           os.path.join(save_path, file_name))
+                _sync_directory(save_path)
+                self._remove_other_formats(save_path, file_name)
+                return True
+        return repaired
+    
+    def recover_all(self):
+        """recover() every game (at startup); returns the repaired names"""
+        if not os.path.exists(self.save_directory):
+            return []
+        return [item for item in os.listdir(self.save_directory)
+                if os.path.isdir(os.path.join(self.save_directory, item)) and self.recover(item)]
+    
+    def _save_file(self, game_name):
+        """Path of the save file of a game, whatever its format, or None"""
+        found = [os.path.join(self.save_directory, game_name, file_name)
+                 for file_name in SAVE_FORMATS.values()]
+        found = [path for path in found if os.path.exists(path)]
+        if not found:
+            return None
+        return max(found, key=os.path.getmtime)
+    
     def load_game(self, game_name):
         """
         Load game data from file
@@ -99,29 +881,267 @@ class SaveManager:
         Returns:
             Dictionary containing game data or None if not found
         """
-        file_path = os.path.join(self.save_directory, game_name, "game_save.json")
+        return self._read_save(game_name)[0]
+    
+    def load_game_journal(self, game_name):
+        """
+        Load the last snapshot of a game and the journal written after it
         
-        if not os.path.exists(file_path):
-            return None
+        Returns:
+            (game data or None, list of journal entries to replay,
+             last seq used by the journal file)
+        """
+        data, save_dict = self._read_save(game_name)
+        if data is None:
+            return None, [], 0
+        
+        entries = ActionJournal.read(self._journal_path(game_name))
+        last_seq = max([int(save_dict.get("journal_seq", 0))] + [e["seq"] for e in entries])
+        if "journal_seq" not in save_dict:
+            return data, [], last_seq  # Full save: any journal file is older
+        
+        after_seq = int(save_dict["journal_seq"])
+        return data, [e for e in entries if e["seq"] > after_seq], last_seq
+    
+    def _read_save(self, game_name):
+        """
+        Decoded game data and raw save dictionary, or (None, None)
         
+        An unreadable save file falls back to its newest readable generation.
+        """
+        file_path = self._save_file(game_name)
+        
+        if file_path is None:
+            return None, None
+        
+        data, save_dict = self._read_save_file(game_name, file_path)
+        if data is None:
+            save_path = os.path.join(self.save_directory, game_name)
+            for _, path in reversed(self._generations(save_path)):
+                data, save_dict = self._read_save_file(game_name, path)
+                if data is not None:
+                    break
+        return data, save_dict
+    
+    def _read_save_file(self, game_name, file_path):
+        """Decoded game data and raw save dictionary of one file"""
+        data, save_dict = self._parse_save_file(file_path)
+        if data is None:
+            return None, None
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                save_dict = json.load(f)
+            self._load_history(game_name, data)
+        except (OSError, KeyError, ValueError):
+            return None, None
+        return data, save_dict
+    
+    def _parse_save_file(self, file_path):
+        """_read_save_file without reading the history segments"""
+        try:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            
+            # The format is detected from the content, not the file name
+            if raw.startswith(BinarySave.MAGIC):
+                return BinarySave.loads(raw)
+            
+            save_dict = json.loads(raw.decode('utf-8'))
             
             # Check if data is encoded
             if save_dict.get("encoded", False):
                 key = save_dict.get("key")
                 if key is None:
-                    return None
+                    return None, None
                 
                 # Decode data
-                decoded_data = self._decode_data(save_dict["data"], key)
-                return decoded_data
+                data = self._decode_data(save_dict["data"], key)
             else:
-                return save_dict["data"]
+                data = save_dict["data"]
+            
+            return data, save_dict
                 
-        except (json.JSONDecodeError, KeyError):
-            return None
+        except (OSError, KeyError, ValueError, struct.error):
+            return None, None
+    
+    def _read_header(self, file_path):
+        """Save dictionary of a save file without decoding its data"""
+        with open(file_path, 'rb') as f:
+            start = f.read(BinarySave.HEADER.size)
+            if start.startswith(BinarySave.MAGIC):
+                return BinarySave.read_header(start)[0]
+            save_dict = json.loads((start + f.read()).decode('utf-8'))
+        save_dict.pop("data", None)
+        return save_dict
+    
+    def migrate(self, game_name, save_format=None):
+        """
+        Rewrite a save in another format (self.save_format if None)
+        
+        Returns:
+            True if the save was rewritten
+        """
+        data, save_dict = self._read_save(game_name)
+        if data is None:
+            return False
+        
+        history = None
+        market = data.get("market")
+        if isinstance(market, dict) and isinstance(market.get("history"), dict) \
+                and isinstance(market["history"].get("values"), array):
+            # Loaded from segments or an inline buffer: keep it in segments
+            history = _SavedHistory(market["history"]["start_turn"], market["history"]["values"])
+            data["market"] = {k: v for k, v in market.items() if k != "history"}
+            data["market"].pop("candles", None)
+        
+        journal_seq = save_dict.get("journal_seq")
+        return self.save_game(game_name, data, bool(save_dict.get("encoded", False)),
+                              None if journal_seq is None else int(journal_seq),
+                              history, save_format)
+    
+    def migrate_all(self, save_format=None):
+        """Rewrite every save in a format; returns the migrated names"""
+        return [save["name"] for save in self.list_saves()
+                if self.migrate(save["name"], save_format)]
+    
+    def _save_history(self, game_name, game_data, history):
+        """Write the new history segments, return game_data referencing them"""
+        segments = self._segments.get(game_name)
+        if segments is None:
+            segments = HistorySegments(
+                os.path.join(self.save_directory, game_name, HistorySegments.DIRECTORY)
+            )
+            self._segments[game_name] = segments
+        segments.write(history.start_turn, history.values(), len(history))
+        
+        market = dict(game_data["market"])
+        market["history"] = {
+            "start_turn": history.start_turn,
+            "length": len(history),
+            "segment_turns": segments.segment_turns,
+            "crc32": segments.crc32
+        }
+        if segments.run is not None:
+            market["history"]["run"] = segments.run
+        return dict(game_data, market=market)
+    
+    def _prune_history(self, game_name):
+        """Once a save moved to a new history run, delete the runs that
+        neither the save file nor a kept generation references"""
+        segments = self._segments.get(game_name)
+        if segments is None or not segments.new_run:
+            return
+        save_path = os.path.join(self.save_directory, game_name)
+        paths = [os.path.join(save_path, file_name) for file_name in SAVE_FORMATS.values()]
+        paths += [path for _, path in self._generations(save_path)]
+        
+        keep = set()
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            data = self._parse_save_file(path)[0]
+            if data is None:
+                return  # Unknown references: keep every run
+            history = data.get("market", {}).get("history")
+            if isinstance(history, dict) and "length" in history:
+                keep.add(HistorySegments.run_of(history))
+        segments.remove_runs(keep)
+        segments.new_run = False
+    
+    def _load_history(self, game_name, data):
+        """Replace a segment reference in loaded data by the courses"""
+        history = data.get("market", {}).get("history")
+        if not isinstance(history, dict) or "length" not in history:
+            return
+        
+        # Encoded saves decode every number as a float
+        start_turn = int(round(history["start_turn"]))
+        segments = HistorySegments(
+            os.path.join(self.save_directory, game_name, HistorySegments.DIRECTORY),
+            int(round(history["segment_turns"])),
+            HistorySegments.run_of(history)
+        )
+        crc32 = history.get("crc32")
+        values = segments.read(start_turn, int(round(history["length"])),
+                               None if crc32 is None else int(round(crc32)))
+        self._segments[game_name] = segments
+        data["market"]["history"] = {"start_turn": start_turn, "values": values}
+    
+    def _journal_path(self, game_name):
+        return os.path.join(self.save_directory, game_name, ActionJournal.FILE_NAME)
+    
+    def start_journal(self, game_name, game_data, seq=0, encode=True, history=None):
+        """
+        Snapshot a game and open its journal (journal mode)
+        
+        Args:
+            game_name: Name of the save
+            game_data: Dictionary containing all game data
+            seq: Last journal entry already applied to game_data
+            history: Optional CourseHistory (see save_game)
+        
+        Returns:
+            ActionJournal to give to the game engine
+        """
+        journal = ActionJournal(self._journal_path(game_name), seq)
+        self.save_snapshot(game_name, game_data, journal, encode, history)
+        return journal
+    
+    def save_snapshot(self, game_name, game_data, journal, encode=True, history=None):
+        """Write a full snapshot and empty the journal it includes"""
+        journal.flush()
+        self.save_game(game_name, game_data, encode, journal_seq=journal.seq, history=history)
+        # A crash here leaves entries <= journal_seq, skipped on load
+        journal.truncate()
+        return True
+    
+    def run_job(self, job):
+        """
+        Perform a save prepared by AutoSaveManager.save (maybe on its worker)
+        
+        Args:
+            job: Dictionary with game_name, journal (or None), entries
+                 (journal entries to append), snapshot: None or
+                 {"game_data", "history", "journal_seq"} and optional
+                 info (catalog fields, see save_game)
+        
+        Returns:
+            True on success
+        """
+        journal = job["journal"]
+        snapshot = job["snapshot"]
+        info = job.get("info")
+        if snapshot is None:
+            if journal is not None and journal.write(job["entries"]):
+                # The game moved on without a new save file
+                self.catalog.update(job["game_name"], saved_at=datetime.now().isoformat(),
+                                    **(info or {}))
+            return True
+        
+        seq = snapshot["journal_seq"]
+        if journal is not None:
+            journal.write([entry for entry in job["entries"] if entry["seq"] <= seq])
+        self.save_game(job["game_name"], snapshot["game_data"], journal_seq=seq,
+                       history=snapshot["history"], info=info)
+        if journal is not None:
+            journal.truncate(seq)
+            journal.write([entry for entry in job["entries"] if entry["seq"] > seq])
+        return True
+    
+    def save_journal(self, game_name, game_data, journal, encode=True, history=None):
+        """
+        Journal mode save: append the new actions, and snapshot every
+        snapshot_interval actions
+        
+        Args:
+            game_data: Dictionary of all game data, or a callable
+                       returning it (only called for a snapshot)
+        """
+        if journal.since_snapshot() >= self.snapshot_interval:
+            if callable(game_data):
+                game_data = game_data()
+            return self.save_snapshot(game_name, game_data, journal, encode, history)
+        
+        journal.flush()
+        return True
     
     def _encode_data(self, data, key):
         """Recursively encode numeric values in dictionary"""
@@ -146,37 +1166,94 @@ class SaveManager:
             return data
     
     def list_saves(self):
-        """List all available save files"""
+        """
+        List all available save files
+        
+        Reads the catalog only: saves missing from it or changed since
+        their entry was written are read again and the catalog fixed.
+        
+        Returns:
+            List of {"name", "saved_at", "version", "mode", "turn",
+            "score", "size"} (mode, turn and score may be None)
+        """
         if not os.path.exists(self.save_directory):
             return []
         
+        entries = self.catalog.read()
+        names = set()
+        changed = False
         saves = []
         for item in os.listdir(self.save_directory):
-            save_path = os.path.join(self.save_directory, item)
-            if os.path.isdir(save_path):
-                # Check if it has a save file
-                save_file = os.path.join(save_path, "game_save.json")
-                if os.path.exists(save_file):
-                    try:
-                        with open(save_file, 'r', encoding='utf-8') as f:
-                            save_data = json.load(f)
-                        
-                        saves.append({
-                            "name": item,
-                            "saved_at": save_data.get("saved_at", "Unknown"),
-                            "version": save_data.get("version", "Unknown")
-                        })
-                    except:
-                        pass
+            entry = entries.get(item)
+            if entry is None or not self._catalog_entry_is_current(item, entry):
+                if not os.path.isdir(os.path.join(self.save_directory, item)):
+                    continue
+                entry = self._catalog_entry(item)
+                if entry is None:
+                    continue
+                entries[item] = entry
+                changed = True
+            
+            names.add(item)
+            saves.append({
+                "name": item,
+                "saved_at": entry.get("saved_at", "Unknown"),
+                "version": entry.get("version", "Unknown"),
+                "mode": entry.get("mode"),
+                "turn": entry.get("turn"),
+                "score": entry.get("score"),
+                "size": entry.get("size", 0)
+            })
         
+        if changed or len(names) != len(entries):
+            self.catalog.write({name: entries[name] for name in names})
         return saves
     
+    def _catalog_entry_is_current(self, game_name, entry):
+        """Whether the save file is still the one described by the entry"""
+        try:
+            stat = os.stat(os.path.join(self.save_directory, game_name, entry["file"]))
+        except (OSError, KeyError, TypeError):
+            return False
+        return stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime")
+    
+    def _catalog_entry(self, game_name):
+        """Catalog entry read from a save file, or None if there is none"""
+        save_file = self._save_file(game_name)
+        if save_file is None:
+            return None
+        try:
+            header = self._read_header(save_file)
+        except (OSError, ValueError, struct.error):
+            return None
+        
+        stat = os.stat(save_file)
+        entry = {
+            "saved_at": header.get("saved_at", "Unknown"),
+            "version": header.get("version", "Unknown"),
+            "file": os.path.basename(save_file),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "mode": None,
+            "turn": None,
+            "score": None
+        }
+        if self.catalog_info is not None:
+            data = self.load_game(game_name)
+            if data is not None:
+                try:
+                    entry.update(self.catalog_info(data))
+                except (KeyError, TypeError, ValueError):
+                    pass  # Not a game save: listed without its details
+        return entry
+    
     def delete_save(self, game_name):
         """Delete a save file"""
         save_path = os.path.join(self.save_directory, game_name)
         
+        self._segments.pop(game_name, None)
+        self.catalog.remove(game_name)
         if os.path.exists(save_path):
-            import shutil
             shutil.rmtree(save_path)
             return True
         return False
@@ -193,29 +1270,197 @@ class SaveManager:
         return saves[0]["name"]
 
 
+class BackgroundSaver:
+    """Runs save jobs on a worker thread
+    
+    At most one job waits: a job submitted while another is waiting is
+    merged into it (journal entries are kept, the newest snapshot wins),
+    so saves never pile up behind a slow disk.
+    """
+    
+    def __init__(self, save_manager):
+        self.save_manager = save_manager
+        self.error = None  # Exception of the last job, if it failed
+        self._condition = threading.Condition()
+        self._job = None
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="auto-save", daemon=True)
+        self._thread.start()
+    
+    def submit(self, job):
+        """Queue a job (SaveManager.run_job format) without waiting"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Background saver is closed")
+            if self._job is not None:
+                job = self._merge(self._job, job)
+            self._job = job
+            self._condition.notify_all()
+    
+    @staticmethod
+    def _merge(older, newer):
+        merged = dict(newer)
+        merged["entries"] = older["entries"] + newer["entries"]
+        if newer["snapshot"] is None:
+            merged["snapshot"] = older["snapshot"]
+        return merged
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._job is None and not self._closed:
+                    self._condition.wait()
+                if self._job is None:
+                    return
+                job, self._job = self._job, None
+                self._busy = True
+            
+            try:
+                self.save_manager.run_job(job)
+                error = None
+            except Exception as e:  # Reported by flush()
+                error = e
+            
+            with self._condition:
+                self.error = error
+                self._busy = False
+                self._condition.notify_all()
+    
+    def flush(self, timeout=None):
+        """
+        Wait for the queued jobs to be written
+        
+        Returns:
+            True if everything was written without error
+        """
+        with self._condition:
+            done = self._condition.wait_for(lambda: self._job is None and not self._busy,
+                                            timeout)
+            return done and self.error is None
+    
+    def close(self):
+        """Flush and stop the worker"""
+        success = self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        return success
+
+
 class AutoSaveManager:
     """Manages automatic saving"""
     
-    def __init__(self, save_manager, interval_seconds=30):
+    def __init__(self, save_manager, interval_seconds=30, background=False):
+        """
+        Args:
+            save_manager: SaveManager writing the saves
+            interval_seconds: Time between two auto-saves
+            background: Write saves on a worker thread (BackgroundSaver)
+        """
         self.save_manager = save_manager
         self.interval_seconds = interval_seconds
         self.last_save_time = 0
+        self.saved_generation = None  # Game generation of the last save
+        self.saver = BackgroundSaver(save_manager) if background else None
     
     def should_auto_save(self, current_time):
         """Check if it's time to auto-save"""
         return (current_time - self.last_save_time) >= self.interval_seconds
     
-    def auto_save(self, game_name, game_data, current_time):
-        """Perform auto-save if needed"""
+    def auto_save(self, game_name, game_data, current_time, journal=None, history=None,
+                  generation=None, info=None, frozen=False):
+        """
+        Perform auto-save if needed
+        
+        Args:
+            game_data: Dictionary of all game data, or a callable
+                       returning it (only called when saving)
+            journal: ActionJournal of the game (journal mode)
+            history: Optional CourseHistory (see SaveManager.save_game)
+            generation: Optional change counter of the game
+                        (GameEngine.generation): unchanged means no save
+            info: Optional catalog fields or callable (see save)
+            frozen: game_data is never modified afterwards (see save)
+        """
+        if generation is not None and generation == self.saved_generation:
+            return False
+        
         if self.should_auto_save(current_time):
             print("\n~~~~~~~~~~~ AUTO-SAVE ~~~~~~~~~~~")
-            success = self.save_manager.save_game(game_name, game_data)
+            success = self.save(game_name, game_data, journal, history, info=info,
+                                frozen=frozen)
             self.last_save_time = current_time
-            if success:
+            self.saved_generation = generation
+            if self.saver is not None:
+                print("Saving in the background...")
+            elif success:
                 print("Game saved successfully!")
             print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~\n")
             return success
         return False
+    
+    def save(self, game_name, game_data, journal=None, history=None, snapshot=False,
+             info=None, frozen=False):
+        """
+        Save now, or hand an immutable copy to the worker (background)
+        
+        Args:
+            game_data: Dictionary of all game data, or a callable
+                       returning it (only called for a full save)
+            journal: ActionJournal (journal mode): only the new actions are
+                     saved, plus a snapshot every snapshot_interval actions
+            history: Optional CourseHistory (see SaveManager.save_game)
+            snapshot: Journal mode: write a snapshot now
+            info: Catalog fields {"mode", "turn", "score"} of the game,
+                  or a callable returning them (see SaveManager.save_game)
+            frozen: game_data is never modified afterwards, like the
+                    state of GameEngine.save_state: the worker gets it
+                    as it is instead of a deep copy
+        
+        Returns:
+            True if saved (background: queued)
+        """
+        if callable(info):
+            info = info()
+        job = {"game_name": game_name, "journal": journal, "entries": [], "snapshot": None,
+               "info": info}
+        if journal is not None:
+            job["entries"] = journal.take()
+            snapshot = snapshot or journal.since_snapshot() >= self.save_manager.snapshot_interval
+        else:
+            snapshot = True
+        
+        if snapshot:
+            if callable(game_data):
+                game_data = game_data()
+            if self.saver is not None and not frozen:
+                game_data = copy.deepcopy(game_data)  # The game goes on meanwhile
+            job["snapshot"] = {
+                "game_data": game_data,
+                "history": None if history is None else
+                           _SavedHistory(history.start_turn, history.values(), len(history)),
+                "journal_seq": None if journal is None else journal.seq,
+            }
+            if journal is not None:
+                journal.snapshot_seq = journal.seq
+        
+        if self.saver is None:
+            return self.save_manager.run_job(job)
+        self.saver.submit(job)
+        return True
+    
+    def flush(self):
+        """Wait for background saves; True if they all succeeded"""
+        return self.saver.flush() if self.saver is not None else True
+    
+    def close(self):
+        """Flush and stop the background worker"""
+        if self.saver is None:
+            return True
+        saver, self.saver = self.saver, None
+        return saver.close()
 
 
 # Example usage
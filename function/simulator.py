@@ -0,0 +1,352 @@
+"""
+Simulator - Monte Carlo runs of many games for balancing
+Plays M games x N turns with a bot strategy across all cores
+"""
+
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from function.game_config import GameMode
+from function.game_engine import GameEngine
+from function.market_system import RunningStats
+
+
+class Strategy:
+    """Bot strategy: decides the actions of a simulated player
+    
+    Subclasses override start() and play(). play() applies actions to
+    the engine and returns how many turns to mine before it is asked
+    again, so strategies that rarely act run at fast_forward speed.
+    """
+    
+    name = "idle"
+    
+    def __init__(self, **params):
+        self.params = params
+    
+    def start(self, engine):
+        """Called once before the first turn"""
+    
+    def play(self, engine):
+        """
+        Act on the current turn
+        
+        Returns:
+            Number of turns to mine before the next call
+        """
+        return 1000
+    
+    def __repr__(self):
+        args = ", ".join(f"{key}={value!r}" for key, value in sorted(self.params.items()))
+        return f"{type(self).__name__}({args})"
+
+
+class PoolStrategy(Strategy):
+    """Join a pool, buy cards with spare dollars and sell what is mined"""
+    
+    name = "pool"
+    
+    def __init__(self, pool_id="C53", card_type="RTX_2080", sell_above=100, interval=10):
+        super().__init__(pool_id=pool_id, card_type=card_type,
+                         sell_above=sell_above, interval=interval)
+    
+    def start(self, engine):
+        engine.apply({"type": "join_pool", "pool_id": self.params["pool_id"]})
+    
+    def play(self, engine):
+        engine.apply({"type": "buy_card", "card_type": self.params["card_type"]})
+        
+        if engine.market.current_course >= self.params["sell_above"] and engine.wallet.arobase >= 1:
+            engine.apply({"type": "sell", "amount": int(engine.wallet.arobase)})
+        
+        return self.params["interval"]
+
+
+class TrendStrategy(Strategy):
+    """Trade on Market.get_trend: buy low on a falling course, sell high on a rising one"""
+    
+    name = "trend"
+    
+    def __init__(self, pool_id="C53", window=5, buy_below=60, sell_above=90,
+                 buy_fraction=0.5, card_budget=20000):
+        super().__init__(pool_id=pool_id, window=window, buy_below=buy_below,
+                         sell_above=sell_above, buy_fraction=buy_fraction,
+                         card_budget=card_budget)
+    
+    def start(self, engine):
+        if self.params["pool_id"]:
+            engine.apply({"type": "join_pool", "pool_id": self.params["pool_id"]})
+    
+    def play(self, engine):
+        params = self.params
+        course = engine.market.current_course
+        trend = engine.market.get_trend(params["window"])
+        
+        if engine.wallet.dollar >= params["card_budget"]:
+            engine.apply({"type": "buy_card", "card_type": "RTX_2080"})
+        
+        if trend == "rising" and course >= params["sell_above"] and engine.wallet.arobase >= 1:
+            engine.apply({"type": "sell", "amount": int(engine.wallet.arobase)})
+        elif trend == "falling" and course <= params["buy_below"]:
+            spend = (engine.wallet.dollar - engine.calculate_tax()) * params["buy_fraction"]
+            if spend >= 1:
+                engine.apply({"type": "buy", "amount": int(spend)})
+        
+        return 1
+
+
+STRATEGIES = {
+    "idle": Strategy,
+    "pool": PoolStrategy,
+    "trend": TrendStrategy,
+}
+
+
+def game_seeds(seed, games):
+    """Market seeds of the simulated games (same for any worker count)"""
+    rng = random.Random(seed)
+    return [rng.randint(10000, 99999) for _ in range(games)]
+
+
+def play_game(strategy, market_seed, turns, game_mode=GameMode.UNLIMITED, event_seed=None):
+    """
+    Play one simulated game
+    
+    Args:
+        strategy: Strategy instance
+        market_seed: Game seed
+        turns: Turns to play
+        game_mode: GameMode of the game
+        event_seed: Seed of the random events (market seed if None)
+    
+    Returns:
+        Dictionary with seed, turns, score, max_dollar and bankrupt_turn
+    """
+    engine = GameEngine.new_game(f"sim_{market_seed}", market_seed, game_mode,
+                                 market_seed if event_seed is None else event_seed)
+    strategy.start(engine)
+    
+    bankrupt_turn = None
+    end_turn = engine.market.current_turn + turns
+    while engine.market.current_turn < end_turn:
+        step = strategy.play(engine) or 1
+        step = min(step, end_turn - engine.market.current_turn)
+        if engine.fast_forward(step)["turns"] == 0:
+            break
+        
+        game_over = engine.check_game_over()
+        if game_over is not None:
+            if not game_over["victory"] and game_over["reason"].startswith("Bankruptcy"):
+                bankrupt_turn = engine.market.current_turn
+            break
+    
+    return {
+        "seed": market_seed,
+        "turns": engine.market.current_turn,
+        "score": engine.get_score(),
+        "max_dollar": engine.wallet.max_dollar,
+        "bankrupt_turn": bankrupt_turn,
+    }
+
+
+class ScoreHistogram:
+    """Sparse fixed-width histogram that can be merged across processes"""
+    
+    def __init__(self, bin_width=10):
+        self.bin_width = bin_width
+        self.bins = {}
+        self.count = 0
+    
+    def add(self, value):
+        """Count a value"""
+        index = int(value // self.bin_width)
+        self.bins[index] = self.bins.get(index, 0) + 1
+        self.count += 1
+    
+    def merge(self, other):
+        """Add the counts of another histogram of the same bin width"""
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += other.count
+    
+    def percentile(self, p):
+        """Approximate percentile (lower edge of the bin holding it)"""
+        if self.count == 0:
+            return None
+        target = p / 100 * self.count
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen >= target:
+                return index * self.bin_width
+        return max(self.bins) * self.bin_width
+    
+    def to_dict(self):
+        """Convert to dictionary ({bin start: count})"""
+        return {
+            "bin_width": self.bin_width,
+            "bins": {index * self.bin_width: self.bins[index] for index in sorted(self.bins)}
+        }
+
+
+class SimulationReport:
+    """Aggregate of simulated games, built one result at a time"""
+    
+    def __init__(self, bin_width=10):
+        self.games = 0
+        self.bankruptcies = 0
+        self.score = RunningStats()
+        self.max_dollar = RunningStats()
+        self.bankrupt_turn = RunningStats()
+        self.histogram = ScoreHistogram(bin_width)
+        self.best = None
+    
+    def add(self, result):
+        """Count one game result"""
+        self.games += 1
+        self.score.add(result["score"])
+        self.max_dollar.add(result["max_dollar"])
+        self.histogram.add(result["score"])
+        
+        if result["bankrupt_turn"] is not None:
+            self.bankruptcies += 1
+            self.bankrupt_turn.add(result["bankrupt_turn"])
+        
+        if self.best is None or self._rank(result) > self._rank(self.best):
+            self.best = result
+    
+    @staticmethod
+    def _rank(result):
+        """Order of results for `best` (ties go to the lowest seed)"""
+        return (result["score"], -result["seed"])
+    
+    def merge(self, other):
+        """Add the games of another report"""
+        self.games += other.games
+        self.bankruptcies += other.bankruptcies
+        self.score.merge(other.score)
+        self.max_dollar.merge(other.max_dollar)
+        self.bankrupt_turn.merge(other.bankrupt_turn)
+        self.histogram.merge(other.histogram)
+        
+        if other.best is not None and (self.best is None or
+                                       self._rank(other.best) > self._rank(self.best)):
+            self.best = other.best
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "games": self.games,
+            "score_mean": self.score.mean,
+            "score_std": self.score.std(),
+            "score_min": self.score.min,
+            "score_max": self.score.max,
+            "score_median": self.histogram.percentile(50),
+            "max_dollar_mean": self.max_dollar.mean,
+            "bankruptcies": self.bankruptcies,
+            "bankrupt_turn_mean": self.bankrupt_turn.mean if self.bankruptcies else None,
+            "best": self.best,
+            "histogram": self.histogram.to_dict()
+        }
+    
+    def display(self, width=40):
+        """Print the summary and the score histogram"""
+        if self.games == 0:
+            print("No games simulated")
+            return
+        
+        print(f"Games: {self.games}")
+        print(f"Score: mean {self.score.mean:.0f} | std {self.score.std():.0f} | "
+              f"min {self.score.min} | max {self.score.max}")
+        print(f"Max dollar (mean): ${self.max_dollar.mean:.2f}")
+        print(f"Bankruptcies: {self.bankruptcies}")
+        if self.bankruptcies:
+            print(f"Bankruptcy turn (mean): {self.bankrupt_turn.mean:.0f}")
+        
+        peak = max(self.histogram.bins.values())
+        print("\nScore distribution:")
+        for start, count in self.histogram.to_dict()["bins"].items():
+            bar = "█" * max(1, int(count / peak * width))
+            print(f"  {start:>12} | {bar} {count}")
+
+
+def _run_batch(task):
+    """Worker: play a batch of games and aggregate them"""
+    strategy, seeds, first_index, base_seed, turns, game_mode, bin_width = task
+    report = SimulationReport(bin_width)
+    for offset, market_seed in enumerate(seeds):
+        event_seed = f"{base_seed}:{first_index + offset}"
+        report.add(play_game(strategy, market_seed, turns, game_mode, event_seed))
+    return report
+
+
+def simulate(strategy, games=1000, turns=1000, seed=0, workers=None, batch_size=25,
+             game_mode=GameMode.UNLIMITED, bin_width=10, seeds=None):
+    """
+    Run many games in parallel and aggregate their results
+    
+    Batches are submitted a few at a time and merged as soon as they
+    finish, so memory does not grow with the number of games.
+    
+    Args:
+        strategy: Strategy instance (sent to every worker)
+        games: Number of games (ignored if seeds is given)
+        turns: Turns per game
+        seed: Base seed of the game and event seeds
+        workers: Number of processes (all cores if None, 0 runs inline)
+        batch_size: Games per worker task
+        game_mode: GameMode of the games
+        bin_width: Score histogram bin width
+        seeds: Optional list of market seeds to play
+    
+    Returns:
+        SimulationReport
+    """
+    if seeds is None:
+        seeds = game_seeds(seed, games)
+    
+    tasks = ((strategy, seeds[i:i + batch_size], i, seed, turns, game_mode, bin_width)
+             for i in range(0, len(seeds), batch_size))
+    
+    report = SimulationReport(bin_width)
+    if workers == 0:
+        for task in tasks:
+            report.merge(_run_batch(task))
+        return report
+    
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        limit = workers * 2
+        pending = set()
+        for task in tasks:
+            pending.add(executor.submit(_run_batch, task))
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report.merge(future.result())
+        for future in pending:
+            report.merge(future.result())
+    
+    return report
+
+
+def main(argv=None):
+    """Command line simulator"""
+    parser = argparse.ArgumentParser(description="Simulate many games with a bot strategy")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="pool")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--bin-width", type=float, default=10)
+    args = parser.parse_args(argv)
+    
+    report = simulate(STRATEGIES[args.strategy](), args.games, args.turns, args.seed,
+                      args.workers, bin_width=args.bin_width)
+    report.display()
+
+
+if __name__ == "__main__":
+    main()
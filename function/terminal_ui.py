@@ -110,7 +110,7 @@ class TerminalUI:
             "[V] Sell @",
             "[A] Buy @",
             "[E] Cancel sale",
-            "[M] Mine",
+            "[M] Mine  (M 50: x50)",
             "",
             "[C] Shop",
             "[P] Mining Pools",
@@ -207,24 +207,37 @@ class TerminalUI:
             print("Invalid range")
             return
         
-        # Extract data for range
-        data_points = {}
-        for turn in range(start_pos, end_pos + 1):
-            if turn in market.history:
-                data_points[turn] = market.history[turn]
+        # Calculate chart dimensions
+        chart_width = 60
+        chart_height = 20
         
-        if not data_points:
+        stats = market.get_range_statistics(start_pos, end_pos)
+        if stats is None:
             print("No data in range")
             return
         
-        # Calculate chart dimensions
-        chart_width = 60
-        chart_height = 20
+        # Long ranges are drawn from the coarsest candles that still give
+        # one candle per column, instead of every turn
+        size = 1
+        for level in sorted(market.candles.levels):
+            if (end_pos - start_pos + 1) // level >= chart_width:
+                size = level
+        
+        # (low, high) of each plotted point
+        avg = stats["average"]
+        if size == 1:
+            points = [(market.history[turn], market.history[turn])
+                      for turn in range(start_pos, end_pos + 1) if turn in market.history]
+            avg = sum(low for low, _ in points) / len(points)
+        else:
+            first = (start_pos - market.candles.start_turn) // size
+            last = (end_pos - market.candles.start_turn) // size
+            points = [(candle["low"], candle["high"])
+                      for candle in market.candles.get_candles(size, first, last)]
         
         # Find min/max in range
-        values = list(data_points.values())
-        min_val = min(values)
-        max_val = max(values)
+        min_val = stats["min"]
+        max_val = stats["max"]
         
         if min_val == max_val:
             print("No variation in selected range")
@@ -234,18 +247,19 @@ class TerminalUI:
         grid = [[' ' for _ in range(chart_width)] for _ in range(chart_height)]
         
         # Plot data
-        turns = sorted(data_points.keys())
-        for i, turn in enumerate(turns):
-            x = int((i / len(turns)) * (chart_width - 1))
-            value = data_points[turn]
+        for i, (low, high) in enumerate(points):
+            x = int((i / len(points)) * (chart_width - 1))
             
-            # Normalize to chart height
-            normalized = (value - min_val) / (max_val - min_val)
-            y = int(normalized * (chart_height - 1))
-            y = chart_height - 1 - y  # Flip Y axis
+            # Normalize to chart height (edge candles may overlap the range)
+            y_values = []
+            for value in (max(low, min_val), min(high, max_val)):
+                normalized = (value - min_val) / (max_val - min_val)
+                y = int(normalized * (chart_height - 1))
+                y_values.append(chart_height - 1 - y)  # Flip Y axis
             
-            if 0 <= x < chart_width and 0 <= y < chart_height:
-                grid[y][x] = '█'
+            for y in range(y_values[1], y_values[0] + 1):
+                if 0 <= x < chart_width and 0 <= y < chart_height:
+                    grid[y][x] = '█'
         
         # Print chart
         print("┌" + "─"*chart_width + "┐")
@@ -256,7 +270,6 @@ class TerminalUI:
         # Print statistics
         print(f"\nRange: Turn {start_pos} to {end_pos}")
         print(f"Max: ${max_val:.2f} | Min: ${min_val:.2f}")
-        avg = sum(values) / len(values)
         print(f"Average: ${avg:.2f}")
     
     @staticmethod
@@ -67,6 +67,9 @@ class Wallet:
             "question": 0,
         }
         
+        # Other coins of a multi-coin market ("@" is kept in arobase)
+        self.coins = {}
+        
         # Statistics
         self.max_dollar = starting_dollar
         self.min_dollar = starting_dollar
@@ -115,6 +118,28 @@ class Wallet:
         self._update_stats()
         return True
     
+    def get_coin(self, symbol):
+        """Get the amount held of a coin"""
+        if symbol == "@":
+            return self.arobase
+        return self.coins.get(symbol, 0)
+    
+    def add_coin(self, symbol, amount):
+        """Add an amount of a coin to wallet"""
+        if symbol == "@":
+            self.add_arobase(amount)
+            return
+        self.coins[symbol] = self.coins.get(symbol, 0) + amount
+    
+    def remove_coin(self, symbol, amount):
+        """Remove an amount of a coin from wallet"""
+        if symbol == "@":
+            return self.remove_arobase(amount)
+        if amount > self.coins.get(symbol, 0):
+            return False
+        self.coins[symbol] -= amount
+        return True
+    
     def put_arobase_for_sale(self, amount):
         """Put arobase up for sale"""
         if amount > self.arobase:
@@ -219,13 +244,23 @@ class Wallet:
         
         return {"success": True}
     
-    def calculate_score(self, current_course):
-        """Calculate player's score"""
+    def calculate_score(self, current_course, courses=None):
+        """
+        Calculate player's score
+        
+        Args:
+            current_course: Course of "@"
+            courses: Courses of the other coins held ({symbol: course})
+        """
         # Total wealth in dollars
         total = self.dollar
         total += self.arobase * current_course
         total += self.arobase_for_sale * current_course
         
+        if courses:
+            for symbol, amount in self.coins.items():
+                total += amount * courses.get(symbol, 0)
+        
         # Add card values
         for card_type, count in self.cards.items():
             card_info = GraphicsCard.get_card_info(card_type)
@@ -280,6 +315,7 @@ class Wallet:
             "arobase_for_sale": self.arobase_for_sale,
             "cards": self.cards,
             "collectibles": self.collectibles,
+            "coins": self.coins,
             "max_dollar": self.max_dollar,
             "min_dollar": self.min_dollar,
             "max_arobase": self.max_arobase,
@@ -294,6 +330,7 @@ class Wallet:
         wallet.arobase_for_sale = data.get("arobase_for_sale", 0)
         wallet.cards = data.get("cards", wallet.cards)
         wallet.collectibles = data.get("collectibles", wallet.collectibles)
+        wallet.coins = data.get("coins", {})
         wallet.max_dollar = data.get("max_dollar", wallet.dollar)
         wallet.min_dollar = data.get("min_dollar", wallet.dollar)
         wallet.max_arobase = data.get("max_arobase", wallet.arobase)
@@ -0,0 +1,83 @@
+"""
+Tests of the game engine: fast_forward against turn-by-turn play
+"""
+
+import json
+import unittest
+
+from function.game_config import GameMode
+from function.game_engine import GameEngine
+from function.mining_pools import MiningManager
+
+
+def new_engine(pool=None, dollar=50000, arobase=100, sale=0, seed=35042):
+    """Engine in a pool with money, arobase and an optional sale order"""
+    engine = GameEngine.new_game("test", seed, GameMode.UNLIMITED, random_seed=seed)
+    engine.wallet.dollar = dollar
+    engine.wallet.arobase = arobase
+    engine.wallet.cards["RTX_2080"] = 2
+    engine.mark_dirty()
+    if pool == "ITS+":
+        engine.apply({"type": "join_pool", "pool_id": "ITS", "secret_code": "3667"})
+    elif pool is not None:
+        engine.apply({"type": "join_pool", "pool_id": pool})
+    if sale:
+        engine.apply({"type": "sell", "amount": sale})
+    return engine
+
+
+def state(engine):
+    """Saved state of an engine, without its clock"""
+    data = engine.to_dict()
+    data["session"].pop("created_at")
+    data["session"].pop("last_update")
+    return json.dumps(data, sort_keys=True, default=str)
+
+
+class FastForwardTest(unittest.TestCase):
+    """fast_forward(n) ends in the same state as n calls to process_turn"""
+    
+    POOLS = [None] + list(MiningManager().pools)
+    
+    def assert_same_as_turns(self, turns, **setup):
+        played = new_engine(**setup)
+        for _ in range(turns):
+            played.process_turn()
+        forwarded = new_engine(**setup)
+        summary = forwarded.fast_forward(turns)
+        
+        self.assertTrue(summary["success"])
+        self.assertEqual(summary["turns"], turns)
+        self.assertEqual(state(forwarded), state(played))
+        self.assertEqual(forwarded.pepe_available, played.pepe_available)
+        for stream in ("mining", "events", "pepe"):
+            self.assertEqual(forwarded.session.random.get(stream).getstate(),
+                             played.session.random.get(stream).getstate())
+    
+    def test_every_pool(self):
+        for pool in self.POOLS:
+            for sale in (0, 40):
+                with self.subTest(pool=pool, sale=sale):
+                    self.assert_same_as_turns(300, pool=pool, sale=sale)
+    
+    def test_idle_turns(self):
+        # Nothing but Pepe can happen after the first turn
+        self.assert_same_as_turns(2000, dollar=500, arobase=0)
+        self.assert_same_as_turns(2000, dollar=500, arobase=3, sale=3)
+    
+    def test_turns_must_be_positive(self):
+        engine = new_engine()
+        for turns in (0, -3):
+            self.assertFalse(engine.apply({"type": "mine", "turns": turns})["success"])
+            self.assertFalse(engine.apply({"type": "fast_forward", "turns": turns})["success"])
+        self.assertEqual(engine.market.current_turn, 0)
+    
+    def test_stops_at_time_limit(self):
+        engine = GameEngine.new_game("test", 35042, GameMode.TIME_LIMITED, random_seed=1)
+        engine.session.created_at -= 10 ** 8
+        self.assertFalse(engine.apply({"type": "fast_forward", "turns": 10})["success"])
+        self.assertEqual(engine.market.current_turn, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
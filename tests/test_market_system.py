@@ -0,0 +1,109 @@
+"""
+Tests of the market: batch and seek paths against turn-by-turn play
+"""
+
+import unittest
+
+from function.market_system import Market, MarketGenerator
+
+
+class LegacyTest(unittest.TestCase):
+    """Courses of the generator before the digit stream (baseline values)"""
+    
+    # get_course(turn) of a fresh generator for these turns, in this order:
+    # each cache miss fills turn - 100..turn + 100 from its own offset
+    ACCESS = [500, 120, 3, 700, 650, 1, 250, 251, 90, 1000]
+    COURSES = {
+        35042: [36, 36, 17, 65, 62, -46, 82, 29, 32, 36],
+        937962751: [21, 21, 78, -44, 66, 5, 3, -18, 49, 21],
+    }
+    FIRST_TURNS = {
+        35042: [-46, 50, 17, 1, -7, 38, 38, -39, 20, -48, -6, 1, 34, 93, 32],
+        937962751: [5, 19, 78, 35, -13, -2, 23, 57, 1, 39, 55, 3, 72, 87, 28],
+    }
+    # Market played 400 turns: sum of the courses, last course, statistics
+    MARKETS = {
+        35042: (1195753.83, 5767,
+                {"max": 5767, "min": 65.4, "average": 2982.1, "volatility": 1723.9}),
+        937962751: (1868707.5, 8999,
+                    {"max": 8999, "min": 70, "average": 4660.29, "volatility": 2662.53}),
+    }
+    
+    def test_random_access(self):
+        for seed, courses in self.COURSES.items():
+            generator = MarketGenerator(seed, legacy=True)
+            self.assertEqual([generator.get_course(turn) for turn in self.ACCESS], courses)
+    
+    def test_turns_in_order(self):
+        for seed, courses in self.FIRST_TURNS.items():
+            for legacy in (True, False):
+                generator = MarketGenerator(seed, legacy=legacy)
+                self.assertEqual([generator.get_course(turn) for turn in range(1, 16)], courses)
+    
+    def test_market(self):
+        for seed, (total, last, statistics) in self.MARKETS.items():
+            for legacy in (True, False):
+                market = Market(seed)
+                market.generator = MarketGenerator(seed, legacy=legacy)
+                courses = [market.advance_turn() for _ in range(400)]
+                self.assertAlmostEqual(sum(courses), total, places=6)
+                self.assertEqual(courses[-1], last)
+                self.assertEqual(market.get_statistics(), statistics)
+
+
+class AdvanceTurnsTest(unittest.TestCase):
+    """advance_turns(n) leaves the market as n calls to advance_turn"""
+    
+    def test_same_market(self):
+        for seed in (35042, 12345, 999999):
+            for steps in ((1,), (7, 1, 250), (3000,), (999, 2, 5000)):
+                played = Market(seed)
+                batched = Market(seed)
+                for count in steps:
+                    courses = [played.advance_turn() for _ in range(count)]
+                    self.assertEqual(batched.advance_turns(count).tolist(), courses)
+                self.assertEqual(batched.to_dict(), played.to_dict())
+                self.assertEqual(batched.get_statistics(), played.get_statistics())
+                self.assertEqual(batched.get_trend(), played.get_trend())
+
+
+class SeekTest(unittest.TestCase):
+    """Market.seek gives the market of a game played from turn 0"""
+    
+    SEEDS = (35042, 12345, 999999)
+    
+    def assert_same_market(self, market, reference):
+        self.assertEqual(market.current_turn, reference.current_turn)
+        self.assertEqual(market.current_course, reference.current_course)
+        self.assertEqual(market.previous_course, reference.previous_course)
+        self.assertEqual(market.get_statistics(), reference.get_statistics())
+        self.assertEqual(market.stats.to_dict(), reference.stats.to_dict())
+    
+    def test_seek_matches_turn_by_turn(self):
+        for seed in self.SEEDS:
+            reference = Market(seed)
+            for _ in range(2500):
+                reference.advance_turn()
+            market = Market(seed)
+            market.seek(2500)
+            self.assert_same_market(market, reference)
+    
+    def test_seek_backward(self):
+        reference = Market(35042)
+        reference.advance_turns(3500)
+        market = Market(35042)
+        market.advance_turns(50000)
+        market.seek(3500)
+        self.assert_same_market(market, reference)
+    
+    def test_statistics_survive_save_and_load(self):
+        for seed in self.SEEDS:
+            market = Market(seed)
+            market.seek(25000)
+            loaded = Market.from_dict(market.to_dict())
+            self.assertEqual(loaded.get_statistics(), market.get_statistics())
+            self.assertEqual(loaded.stats.count, 25001)
+
+
+if __name__ == "__main__":
+    unittest.main()
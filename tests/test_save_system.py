@@ -0,0 +1,176 @@
+"""
+Tests of the save system: journal replay and crash recovery
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from function.game_config import GameMode
+from function.game_engine import GameEngine
+from function.save_system import ActionJournal, SaveManager
+
+
+ACTIONS = [
+    {"type": "join_pool", "pool_id": "C53"},
+    {"type": "mine", "turns": 5},
+    {"type": "buy_card", "card_type": "RTX_2080"},
+    {"type": "mine", "turns": 40},
+    {"type": "sell", "amount": 1},
+    {"type": "mine"},
+    {"type": "buy", "amount": 100},
+    {"type": "mine", "turns": 300},
+]
+
+
+def state(engine):
+    return json.dumps(engine.to_dict(), sort_keys=True, default=str)
+
+
+class SaveTestCase(unittest.TestCase):
+    """Test case with a save directory of its own"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+    
+    def new_engine(self):
+        engine = GameEngine.new_game("test", 35042, GameMode.UNLIMITED, random_seed=7)
+        engine.wallet.dollar = 20000
+        engine.mark_dirty()
+        return engine
+
+
+class JournalTest(SaveTestCase):
+    """A snapshot plus its replayed journal gives the live game back"""
+    
+    def play_journaled(self, save_manager):
+        engine = self.new_engine()
+        engine.journal = save_manager.start_journal("test", engine.save_state(), encode=False,
+                                                    history=engine.market.history)
+        for action in ACTIONS:
+            self.assertTrue(engine.apply(action)["success"], action)
+            save_manager.save_journal("test", engine.save_state, engine.journal, encode=False,
+                                      history=engine.market.history)
+        return engine
+    
+    def load(self, save_manager):
+        data, entries, _ = save_manager.load_game_journal("test")
+        engine = GameEngine.from_dict(data)
+        self.assertEqual(engine.replay(entries), len(entries))
+        return engine, entries
+    
+    def test_replay_equals_live_game(self):
+        save_manager = SaveManager(self.directory, save_mode="journal")
+        live = self.play_journaled(save_manager)
+        loaded, entries = self.load(SaveManager(self.directory, save_mode="journal"))
+        self.assertEqual(len(entries), len(ACTIONS))
+        self.assertEqual(state(loaded), state(live))
+    
+    def test_replay_after_snapshots(self):
+        save_manager = SaveManager(self.directory, save_mode="journal", snapshot_interval=3)
+        live = self.play_journaled(save_manager)
+        loaded, entries = self.load(SaveManager(self.directory, save_mode="journal"))
+        self.assertLess(len(entries), len(ACTIONS))
+        self.assertEqual(state(loaded), state(live))
+    
+    def test_line_without_seq_ends_journal(self):
+        path = os.path.join(self.directory, ActionJournal.FILE_NAME)
+        lines = [{"seq": 1, "turn": 0, "action": {"type": "cancel"}},
+                 {"turn": 1, "action": {"type": "mine"}},
+                 {"seq": 3, "turn": 2, "action": {"type": "mine"}}]
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(line) + "\n" for line in lines))
+        self.assertEqual([entry["seq"] for entry in ActionJournal.read(path)], [1])
+        
+        lines[1]["seq"] = "2"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(line) + "\n" for line in lines))
+        self.assertEqual([entry["seq"] for entry in ActionJournal.read(path)], [1])
+
+
+class HistorySegmentsTest(SaveTestCase):
+    """Market history saved in segment files next to an encoded save"""
+    
+    def save(self, engine, save_format):
+        SaveManager(self.directory, save_format=save_format).save_game(
+            "test", engine.to_dict(history=False), encode=True, history=engine.market.history
+        )
+    
+    def test_changed_segment_is_rejected(self):
+        for save_format in ("json", "binary"):
+            with self.subTest(save_format=save_format):
+                engine = self.new_engine()
+                engine.apply({"type": "mine", "turns": 500})
+                self.save(engine, save_format)
+                data = SaveManager(self.directory).load_game("test")
+                self.assertEqual(list(data["market"]["history"]["values"]),
+                                 list(engine.market.history.values()))
+                
+                history = os.path.join(self.directory, "test", "history")
+                run = os.path.join(history, sorted(os.listdir(history))[-1])
+                with open(os.path.join(run, "segment_000000.bin"), "r+b") as f:
+                    f.seek(80)
+                    f.write(b"\x00" * 8)
+                self.assertIsNone(SaveManager(self.directory).load_game("test"))
+                shutil.rmtree(os.path.join(self.directory, "test"))
+
+
+class Crash(Exception):
+    """Stands for the process dying in the middle of a save"""
+
+
+class CrashingSaveManager(SaveManager):
+    """Stops a save once the temporary file is written, before the rename"""
+    
+    def _finish_commit(self, save_path, file_name):
+        raise Crash()
+
+
+class RecoverTest(SaveTestCase):
+    """recover() finishes or undoes a save interrupted by a crash"""
+    
+    def setUp(self):
+        super().setUp()
+        self.engine = self.new_engine()
+        SaveManager(self.directory).save_game("test", self.engine.to_dict(), encode=False)
+        self.saved = state(self.engine)
+        
+        self.engine.apply({"type": "mine", "turns": 50})
+        with self.assertRaises(Crash):
+            CrashingSaveManager(self.directory).save_game("test", self.engine.to_dict(),
+                                                          encode=False)
+        self.save_path = os.path.join(self.directory, "test")
+        self.tmp_path = os.path.join(self.save_path, "game_save.json" + SaveManager.TMP_SUFFIX)
+        self.assertTrue(os.path.exists(os.path.join(self.save_path, SaveManager.WAL_FILE)))
+    
+    def loaded_state(self):
+        return state(GameEngine.from_dict(SaveManager(self.directory).load_game("test")))
+    
+    def assert_clean(self):
+        self.assertFalse(os.path.exists(os.path.join(self.save_path, SaveManager.WAL_FILE)))
+        self.assertFalse(os.path.exists(self.tmp_path))
+    
+    def test_complete_save_rolls_forward(self):
+        self.assertTrue(SaveManager(self.directory).recover("test"))
+        self.assert_clean()
+        self.assertEqual(self.loaded_state(), state(self.engine))
+    
+    def test_partial_save_rolls_back(self):
+        with open(self.tmp_path, "r+b") as f:
+            f.truncate(os.path.getsize(self.tmp_path) // 2)
+        self.assertTrue(SaveManager(self.directory).recover("test"))
+        self.assert_clean()
+        self.assertEqual(self.loaded_state(), self.saved)
+    
+    def test_unreadable_save_loads_generation(self):
+        SaveManager(self.directory).recover("test")
+        with open(os.path.join(self.save_path, "game_save.json"), "wb") as f:
+            f.write(b"{broken")
+        self.assertEqual(self.loaded_state(), self.saved)
+
+
+if __name__ == "__main__":
+    unittest.main()